@@ -203,10 +203,16 @@ class CounterLogFormatter(logging.Formatter):
         return msg
 
 
+import contextvars
 import logging
 
 # Main attribute logger
 
+# attributes bound to the current request, each context sees its own copy
+_context_attributes: contextvars.ContextVar = contextvars.ContextVar(
+    "attribute_logger_context", default={}
+)
+
 
 class AttributeLogger(object):
     """
@@ -214,27 +220,17 @@ class AttributeLogger(object):
     attributes that are automatically inserted as extra params on every log
     call.
 
+    Instances are immutable, `with_attributes` returns a new logger. Attributes
+    of the current request are bound with `bind` and live in a context
+    variable, so concurrent requests never see each other's attributes under
+    threaded WSGI or ASGI.
+
     Attributes:
         logger (logging.Logger): The underlying logger instance.
         attributes (dict): A dictionary containing attributes to be included in every log call.
     """
 
-    _instance = None
-    attributes: dict = {}
-
-    def __new__(cls, *args, **kwargs):
-        """
-        Ensure that only one instance of AttributeLogger is created using the Singleton pattern.
-
-        Returns:
-            AttributeLogger: The singleton instance of AttributeLogger.
-        """
-        if not cls._instance:
-            cls._instance = super(AttributeLogger, cls).__new__(cls)
-        return cls._instance
-
-    def __del__(self):
-        print(f"------{self} is being destroyed-----")
+    __slots__ = ("logger", "attributes")
 
     def __init__(self, logger: logging.Logger, **attr):
         """
@@ -247,6 +243,45 @@ class AttributeLogger(object):
         self.logger = logger
         self.attributes = attr
 
+    @staticmethod
+    def bind(**attributes) -> contextvars.Token:
+        """
+        Add attributes to every log call made in the current context.
+
+        Args:
+            **attributes: Attributes to be included in every log call.
+
+        Returns:
+            contextvars.Token: Token to pass to `unbind` once the request is done.
+        """
+        return _context_attributes.set({**_context_attributes.get(), **attributes})
+
+    @staticmethod
+    def unbind(token: contextvars.Token):
+        """
+        Restore the context attributes to what they were before `bind`.
+
+        Args:
+            token (contextvars.Token): The token returned by `bind`.
+        """
+        # not `reset`, a deferred response may be rendered in a copied context
+        if token.old_value is contextvars.Token.MISSING:
+            _context_attributes.set({})
+        else:
+            _context_attributes.set(token.old_value)
+
+    def _log(self, level: int, msg: str, args, kwargs):
+        # the extra dict is only built when the record will be emitted
+        if not self.logger.isEnabledFor(level):
+            return
+        context_attributes = _context_attributes.get()
+        if context_attributes:
+            kwargs["extra"] = {**context_attributes, **self.attributes}
+        else:
+            kwargs["extra"] = self.attributes
+        kwargs["stacklevel"] = 3
+        self.logger.log(level, msg, *args, **kwargs)
+
     def info(self, msg: str, *args, **kwargs):
         """
         Log an info message with additional attributes.
@@ -256,9 +291,7 @@ class AttributeLogger(object):
             *args: Variable length argument list.
             **kwargs: Keyword arguments for additional configuration.
         """
-        kwargs["extra"] = self.attributes
-        kwargs["stacklevel"] = 2
-        self.logger.info(msg, *args, **kwargs)
+        self._log(logging.INFO, msg, args, kwargs)
 
     def error(self, msg: str, *args, **kwargs):
         """
@@ -269,9 +302,7 @@ class AttributeLogger(object):
             *args: Variable length argument list.
             **kwargs: Keyword arguments for additional configuration.
         """
-        kwargs["extra"] = self.attributes
-        kwargs["stacklevel"] = 2
-        self.logger.error(msg, *args, **kwargs)
+        self._log(logging.ERROR, msg, args, kwargs)
 
     def debug(self, msg: str, *args, **kwargs):
         """
@@ -282,9 +313,7 @@ class AttributeLogger(object):
             *args: Variable length argument list.
             **kwargs: Keyword arguments for additional configuration.
         """
-        kwargs["extra"] = self.attributes
-        kwargs["stacklevel"] = 2
-        self.logger.debug(msg, *args, **kwargs)
+        self._log(logging.DEBUG, msg, args, kwargs)
 
     def warning(self, msg: str, *args, **kwargs):
         """
@@ -295,9 +324,7 @@ class AttributeLogger(object):
             *args: Variable length argument list.
             **kwargs: Keyword arguments for additional configuration.
         """
-        kwargs["extra"] = self.attributes
-        kwargs["stacklevel"] = 2
-        self.logger.warning(msg, *args, **kwargs)
+        self._log(logging.WARNING, msg, args, kwargs)
 
     def fatal(self, msg: str, *args, **kwargs):
         """
@@ -308,9 +335,7 @@ class AttributeLogger(object):
             *args: Variable length argument list.
             **kwargs: Keyword arguments for additional configuration.
         """
-        kwargs["extra"] = self.attributes
-        kwargs["stacklevel"] = 2
-        self.logger.fatal(msg, *args, **kwargs)
+        self._log(logging.FATAL, msg, args, kwargs)
 
     def with_attributes(self, **kwargs):
         """
@@ -322,9 +347,7 @@ class AttributeLogger(object):
         Returns:
             AttributeLogger: A new instance of AttributeLogger with the updated attributes.
         """
-        new_attrs = self.attributes.copy()
-        new_attrs.update(kwargs)
-        return AttributeLogger(self.logger, **new_attrs)
+        return AttributeLogger(self.logger, **{**self.attributes, **kwargs})
 
 
 # use of the AttributeLogger
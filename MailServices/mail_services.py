@@ -1,5 +1,8 @@
+from functools import lru_cache
+from itertools import islice
+
 from django.conf import settings
-from django.core.mail import EmailMessage
+from django.core.mail import EmailMessage, get_connection
 from utils.django.exceptions import MailNotSendException, TemplateNotFoundException
 
 
@@ -74,7 +77,22 @@ class Mail(EmailMessage):
         self.template_id = template_id
 
 
+@lru_cache(maxsize=None)
+def get_template_id(template_name: str, language: str):
+    """
+    Resolve the SendGrid template id of a template name and language.
+
+    SENDGRID_TEMPLATES is loaded once with the settings, so the lookups are
+    cached for the lifetime of the process.
+    """
+    template_selection = settings.SENDGRID_TEMPLATES.get(template_name) or {}
+    return template_selection.get(language.lower())
+
+
 class MailerServices:
+    # SendGrid accepts at most 1000 personalizations per request
+    max_personalizations = 1000
+
     def __init__(self):
         self.log = log
         self.from_email = settings.EMAIL_FROM_ADDRESS
@@ -102,14 +120,7 @@ class MailerServices:
         """
         if settings.ENABLE_MAILS:
             try:
-                template_selection = settings.SENDGRID_TEMPLATES.get(template_name)
-                template_id = template_selection.get(language.lower())
-
-                if not template_id:
-                    self.log.error("Template_id not found for selected language")
-                    raise TemplateNotFoundException(
-                        "template-not-found", f"Template Not Found, {str(e)}", self.log
-                    )
+                template_id = self.get_template_id(template_name, language)
 
                 self.set_mail_instance()
                 self.mail_instance.set_mail_data(
@@ -125,3 +136,74 @@ class MailerServices:
                 raise MailNotSendException("mail-not-send-exception", str(e), self.log)
         else:
             self.log.info(f"{template_data}-send-email-data-for-{email}")
+
+    def get_template_id(self, template_name: str, language: str) -> str:
+        template_id = get_template_id(template_name, language)
+        if not template_id:
+            self.log.error("Template_id not found for selected language")
+            raise TemplateNotFoundException(
+                "template-not-found",
+                f"Template Not Found, {template_name} ({language})",
+                self.log,
+            )
+        return template_id
+
+    def send_bulk_mail(
+        self,
+        recipients,
+        subject: str,
+        template_name: str,
+        language: str = settings.DEFAULT_GERMAN_LANGUAGE,
+    ) -> int:
+        """
+        Send the same template to many recipients, each with its own template data.
+
+        One backend connection is used for the whole batch and every request to
+        SendGrid carries up to `max_personalizations` recipients.
+
+        parameters:
+            recipients: iterable of (email, template_data) pairs.
+
+            template_name, language: same as in `send_mail`.
+
+        returns:
+            The number of recipients the mail was sent to.
+        """
+        recipients = iter(recipients)
+        if not settings.ENABLE_MAILS:
+            for email, template_data in recipients:
+                self.log.info(f"{template_data}-send-email-data-for-{email}")
+            return 0
+
+        sent = 0
+        try:
+            template_id = self.get_template_id(template_name, language)
+            with get_connection(fail_silently=False) as connection:
+                while True:
+                    chunk = list(islice(recipients, self.max_personalizations))
+                    if not chunk:
+                        break
+                    self.get_bulk_mail(
+                        chunk, subject, template_id, connection
+                    ).send(fail_silently=False)
+                    sent += len(chunk)
+        except Exception as e:
+            self.log.error(f"{e}, sent to {sent} recipients")
+            raise MailNotSendException("mail-not-send-exception", str(e), self.log)
+        return sent
+
+    def get_bulk_mail(self, chunk, subject, template_id, connection) -> Mail:
+        mail = Mail(connection=connection)
+        mail.set_mail_data(
+            subject=subject,
+            from_email=self.from_email,
+            # only used by Django to check there are recipients, SendGrid
+            # delivers to the personalizations
+            to=[email for email, _ in chunk],
+            template_id=template_id,
+        )
+        mail.personalizations = [
+            {"to": [{"email": email}], "dynamic_template_data": template_data}
+            for email, template_data in chunk
+        ]
+        return mail
@@ -0,0 +1,97 @@
+"""This is a model module to store outgoing mails until they are relayed to SendGrid"""
+
+import uuid
+from dataclasses import dataclass
+
+from django.db import models
+from django.utils import timezone
+from utils.django import custom_models
+
+
+@dataclass(frozen=True)
+class MailOutboxID:
+    """
+    This is a value object that should be used to generate and pass the MailOutboxID to the MailOutboxFactory
+    """
+
+    value: uuid.UUID
+
+
+# ----------------------------------------------------------------------
+# MailOutbox Model
+# ----------------------------------------------------------------------
+
+
+class MailOutbox(custom_models.ActivityTracking):
+    """
+    Represents a mail recorded in the business transaction, sent later by the
+    `relay_mail_outbox` task
+    """
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+    STATUS_TYPES = [
+        (PENDING, "pending"),
+        (SENT, "sent"),
+        (FAILED, "failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, editable=False, default=uuid.uuid4)
+    email = models.EmailField()
+    subject = models.CharField(max_length=250, blank=True)
+    template_name = models.CharField(max_length=100)
+    language = models.CharField(max_length=10)
+    template_data = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_TYPES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Mail Outbox"
+        verbose_name_plural = "Mail Outbox"
+        db_table = "mail_outbox"
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+
+class MailOutboxFactory:
+    @staticmethod
+    def build_entity(
+        id: MailOutboxID,
+        email: str,
+        subject: str,
+        template_name: str,
+        language: str,
+        template_data: dict,
+    ) -> MailOutbox:
+        return MailOutbox(
+            id=id.value,
+            email=email,
+            subject=subject,
+            template_name=template_name,
+            language=language,
+            template_data=template_data,
+        )
+
+    @classmethod
+    def build_entity_with_id(
+        cls,
+        email: str,
+        subject: str,
+        template_name: str,
+        language: str,
+        template_data: dict,
+    ) -> MailOutbox:
+        """This is a factory method used for build an instance of MailOutbox"""
+        entity_id = MailOutboxID(uuid.uuid4())
+        return cls.build_entity(
+            id=entity_id,
+            email=email,
+            subject=subject,
+            template_name=template_name,
+            language=language,
+            template_data=template_data,
+        )
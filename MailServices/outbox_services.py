@@ -0,0 +1,140 @@
+import datetime
+import logging
+from itertools import groupby
+from typing import Type
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.manager import BaseManager
+from django.utils import timezone
+from focus_power.infrastructure.logger.models import AttributeLogger
+
+from .mail_services import MailerServices
+from .models import MailOutbox, MailOutboxFactory
+
+log = AttributeLogger(logging.getLogger("focus_power.mail_outbox"))
+
+
+class MailOutboxServices:
+    """
+    Mails are recorded in the caller's transaction with `queue_mail` and
+    sent by `relay`, so a rolled back transaction never sends a mail and a
+    slow SendGrid never blocks a request.
+    """
+
+    batch_size = 500
+    max_attempts = 5
+    # retry delay is backoff * 2 ** (attempts - 1), capped at max_backoff
+    backoff = datetime.timedelta(seconds=30)
+    max_backoff = datetime.timedelta(hours=1)
+
+    def __init__(self):
+        self.log = log
+        self.mailer_services = MailerServices()
+
+    @staticmethod
+    def get_mail_outbox_factory() -> Type[MailOutboxFactory]:
+        return MailOutboxFactory
+
+    @staticmethod
+    def get_mail_outbox_repo() -> BaseManager[MailOutbox]:
+        return MailOutbox.objects
+
+    def queue_mail(
+        self,
+        email: str,
+        subject: str,
+        template_data: dict,
+        template_name: str,
+        language: str = settings.DEFAULT_GERMAN_LANGUAGE,
+    ) -> MailOutbox:
+        """Same arguments as `MailerServices.send_mail`."""
+        mail = self.get_mail_outbox_factory().build_entity_with_id(
+            email=email,
+            subject=subject,
+            template_name=template_name,
+            language=language,
+            template_data=template_data,
+        )
+        mail.save()
+        return mail
+
+    def relay(self) -> int:
+        """
+        Send up to `batch_size` due mails, grouped per template into bulk
+        sends. Rows are locked with SKIP LOCKED so relays can run in
+        parallel.
+
+        Returns the number of mails sent.
+        """
+        now = timezone.now()
+        sent = failed = 0
+        latencies = []
+        with transaction.atomic():
+            mails = list(
+                self.get_mail_outbox_repo()
+                .select_for_update(skip_locked=True)
+                .filter(status=MailOutbox.PENDING, next_attempt_at__lte=now)
+                .order_by("next_attempt_at")[: self.batch_size]
+            )
+            mails.sort(key=self.get_template_key)
+            for (template_name, language, subject), group in groupby(
+                mails, key=self.get_template_key
+            ):
+                group = list(group)
+                try:
+                    self.mailer_services.send_bulk_mail(
+                        [(mail.email, mail.template_data) for mail in group],
+                        subject,
+                        template_name,
+                        language,
+                    )
+                except Exception as e:
+                    failed += len(group)
+                    for mail in group:
+                        self.mark_failed_attempt(mail, str(e), now)
+                    continue
+
+                sent_at = timezone.now()
+                sent += len(group)
+                for mail in group:
+                    mail.status = MailOutbox.SENT
+                    mail.attempts += 1
+                    mail.sent_at = sent_at
+                    latencies.append((sent_at - mail.created_at).total_seconds())
+
+            self.get_mail_outbox_repo().bulk_update(
+                mails,
+                ["status", "attempts", "next_attempt_at", "last_error", "sent_at"],
+            )
+
+        self.log_metrics(sent, failed, latencies)
+        return sent
+
+    @staticmethod
+    def get_template_key(mail: MailOutbox) -> tuple:
+        return mail.template_name, mail.language, mail.subject
+
+    def mark_failed_attempt(self, mail: MailOutbox, error: str, now):
+        mail.attempts += 1
+        mail.last_error = error
+        if mail.attempts >= self.max_attempts:
+            mail.status = MailOutbox.FAILED
+            return
+        delay = min(self.backoff * 2 ** (mail.attempts - 1), self.max_backoff)
+        mail.next_attempt_at = now + delay
+
+    def log_metrics(self, sent: int, failed: int, latencies: list):
+        queue_depth = self.get_mail_outbox_repo().filter(
+            status=MailOutbox.PENDING
+        ).count()
+        latencies.sort()
+        self.log.info(
+            "mail outbox relay sent=%d failed=%d queue_depth=%d "
+            "latency_p50_s=%.1f latency_max_s=%.1f",
+            sent,
+            failed,
+            queue_depth,
+            latencies[len(latencies) // 2] if latencies else 0.0,
+            latencies[-1] if latencies else 0.0,
+        )
@@ -0,0 +1,33 @@
+from django.conf import settings
+from focus_power.celery import app
+
+from .mail_services import MailerServices
+from .outbox_services import MailOutboxServices
+
+
+@app.task
+def send_bulk_mail(
+    recipients: list,
+    subject: str,
+    template_name: str,
+    language: str = settings.DEFAULT_GERMAN_LANGUAGE,
+):
+    """
+    Celery task for `MailerServices.send_bulk_mail`, `recipients` is a list of
+    [email, template_data] pairs so it can be serialized to JSON.
+    """
+    return MailerServices().send_bulk_mail(
+        recipients, subject, template_name, language
+    )
+
+
+@app.task
+def relay_mail_outbox():
+    """
+    Send the due mails of the outbox, scheduled every minute with celery beat.
+    Runs again right away while full batches are being sent.
+    """
+    sent = MailOutboxServices().relay()
+    if sent >= MailOutboxServices.batch_size:
+        relay_mail_outbox.delay()
+    return sent
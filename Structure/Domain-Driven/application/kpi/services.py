@@ -1,6 +1,7 @@
 import datetime
+import itertools
 from datetime import timezone
-from typing import List, Tuple, Union
+from typing import Iterator, List, Tuple, Union
 
 from django.conf import settings
 from django.db import models, transaction
@@ -765,6 +766,22 @@ class KPIAppServices(BaseAppServiceWithAttributeLogger):
 
 
 class KPIFrequencyAppServices(BaseAppServiceWithAttributeLogger):
+    export_fields = [
+        "id",
+        "name",
+        "unit_type",
+        "unit",
+        "frequency",
+        "reporting_person_id",
+        "year",
+        "yearly_target",
+        "yearly_actual",
+        "yearly_percentage",
+        "ytd_target",
+        "ytd_actual",
+        "ytd_percentage",
+    ]
+
     def __init__(
         self,
         user: User,
@@ -1316,6 +1333,79 @@ class KPIFrequencyAppServices(BaseAppServiceWithAttributeLogger):
             .order_by("year")
         )
 
+    def list_kpi_frequency_by_kpi_ids(self, kpi_ids, year) -> QuerySet[KPIFrequency]:
+        """This method will return KPI-Frequency of the given KPIs for a year."""
+        return (
+            self.list_all_kpi_frequency(user=self.user)
+            .filter(kpi_id__in=kpi_ids)
+            .annotate(
+                year=Subquery(
+                    CalenderManager.objects.filter(
+                        id=OuterRef("calender_manager_id")
+                    ).values("year")
+                )
+            )
+            .filter(year=year)
+            .only("kpi_id", "daily_data", "yearly_data")
+        )
+
+    def iter_kpi_export_rows(
+        self, kpi_queryset: QuerySet[KPI], year, chunk_size: int = 500
+    ) -> Iterator[dict]:
+        """
+        This method will yield the yearly and YTD rollup of every KPI, reading
+        the KPIs and their KPI-Frequency in batches of `chunk_size`.
+        """
+        kpi_iterator = kpi_queryset.iterator(chunk_size=chunk_size)
+        while True:
+            kpi_batch = list(itertools.islice(kpi_iterator, chunk_size))
+            if not kpi_batch:
+                return
+            kpi_frequency_dict = {
+                str(kpi_frequency.kpi_id): kpi_frequency
+                for kpi_frequency in self.list_kpi_frequency_by_kpi_ids(
+                    kpi_ids=[kpi.id for kpi in kpi_batch], year=year
+                )
+            }
+            for kpi in kpi_batch:
+                yield self.get_kpi_export_row(
+                    kpi=kpi,
+                    kpi_frequency=kpi_frequency_dict.get(str(kpi.id)),
+                    year=year,
+                )
+
+    def get_kpi_export_row(
+        self, kpi: KPI, kpi_frequency: Union[KPIFrequency, None], year
+    ) -> dict:
+        """Same rollup as `calculate_yearly_data` and `calculate_total_ytd_data`."""
+        yearly_target = yearly_actual = ytd_target = ytd_actual = 0
+        if kpi_frequency:
+            if kpi_frequency.yearly_data:
+                yearly_target = kpi_frequency.yearly_data[0]["target"]
+                yearly_actual = kpi_frequency.yearly_data[0]["actual"]
+            ytd_target, ytd_actual = self.count_target_actual_until_date_data(
+                kpi_frequency.daily_data
+            )
+        return {
+            "id": str(kpi.id),
+            "name": kpi.name,
+            "unit_type": kpi.unit_type,
+            "unit": kpi.unit,
+            "frequency": kpi.frequency,
+            "reporting_person_id": str(kpi.reporting_person_id),
+            "year": year,
+            "yearly_target": yearly_target,
+            "yearly_actual": yearly_actual,
+            "yearly_percentage": self.get_percentage(
+                base_value=yearly_target, actual_value=yearly_actual
+            ),
+            "ytd_target": ytd_target,
+            "ytd_actual": ytd_actual,
+            "ytd_percentage": self.get_percentage(
+                base_value=ytd_target, actual_value=ytd_actual
+            ),
+        }
+
 
 class RelativeKPIAppServices(BaseAppServiceWithAttributeLogger):
     def __init__(self) -> None:
@@ -0,0 +1,55 @@
+"""
+Formats a batch of log records with the project formatters and prints the
+throughput.
+
+    python -m focus_power.infrastructure.logger.benchmark --records 1000000
+"""
+import argparse
+import logging
+import time
+
+from .services import CounterLogFormatter, CustomizedJSONFormatter
+
+
+def make_records(count: int):
+    record = logging.makeLogRecord(
+        {
+            "name": "focus_power.application.kpi.services",
+            "levelno": logging.INFO,
+            "levelname": "INFO",
+            "funcName": "list_all_kpi",
+            "msg": "Listed %s KPIs for %s",
+            "args": (25, "company"),
+            "user_id": "9b5a4f52-6e0c-4a43-a4a8-2d7a1f1c2f0e",
+            "service": "kpi",
+        }
+    )
+    created = time.time()
+    for index in range(count):
+        # spread the records over a few seconds like a real stream
+        record.created = created + index / 100000
+        yield record
+
+
+def benchmark(formatter: logging.Formatter, count: int) -> float:
+    started_at = time.perf_counter()
+    for record in make_records(count):
+        formatter.format(record)
+    return time.perf_counter() - started_at
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=1000000)
+    options = parser.parse_args()
+
+    for formatter in (CustomizedJSONFormatter(), CounterLogFormatter()):
+        elapsed = benchmark(formatter, options.records)
+        print(
+            f"{type(formatter).__name__}: {options.records} records in "
+            f"{elapsed:.2f}s ({options.records / elapsed:,.0f} records/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
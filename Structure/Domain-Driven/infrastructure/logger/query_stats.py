@@ -0,0 +1,208 @@
+import atexit
+import contextvars
+import hashlib
+import logging
+import random
+import re
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger("focus_power.query_stats")
+
+# queries of the current request, `None` outside of requests or when the
+# request was not sampled
+_request_stats: contextvars.ContextVar = contextvars.ContextVar(
+    "request_query_stats", default=None
+)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """Replaces literals and `IN (...)` lists so equal statements group together."""
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _PLACEHOLDER_LIST.sub("(?)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def fingerprint_sql(sql: str) -> str:
+    return hashlib.md5(sql.encode("utf-8")).hexdigest()[:12]
+
+
+class QueryStats:
+    """
+    Aggregated statistics of one SQL fingerprint. Durations are kept in a
+    bounded reservoir sample for the p95.
+    """
+
+    __slots__ = ("sql", "count", "total_time", "rows", "durations")
+
+    max_durations = 1000
+
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.count = 0
+        self.total_time = 0.0
+        self.rows = 0
+        self.durations = []
+
+    def add(self, duration: float, rows: int):
+        self.count += 1
+        self.total_time += duration
+        self.rows += max(rows, 0)
+        if len(self.durations) < self.max_durations:
+            self.durations.append(duration)
+        else:
+            index = random.randrange(self.count)
+            if index < self.max_durations:
+                self.durations[index] = duration
+
+    @property
+    def p95(self) -> float:
+        durations = sorted(self.durations)
+        return durations[int(len(durations) * 0.95)] if durations else 0.0
+
+
+class QueryStatsCollector:
+    """
+    Process wide aggregation of the sampled queries, the summary is written
+    to the `focus_power.query_stats` logger every `flush_interval` seconds.
+    """
+
+    def __init__(self, flush_interval: int = 60):
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.n_plus_one = {}
+        self.last_flush = time.monotonic()
+
+    def record(self, fingerprint: str, sql: str, duration: float, rows: int):
+        with self.lock:
+            stats = self.stats.get(fingerprint)
+            if stats is None:
+                stats = self.stats[fingerprint] = QueryStats(sql)
+            stats.add(duration, rows)
+        self.flush_if_due()
+
+    def record_n_plus_one(self, path: str, fingerprint: str, sql: str, count: int):
+        with self.lock:
+            key = (path, fingerprint)
+            # only the worst request of the interval is reported
+            if count > self.n_plus_one.get(key, (0, ""))[0]:
+                self.n_plus_one[key] = (count, sql)
+
+    def flush_if_due(self):
+        if time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            stats, self.stats = self.stats, {}
+            n_plus_one, self.n_plus_one = self.n_plus_one, {}
+            self.last_flush = time.monotonic()
+
+        for fingerprint, query in sorted(
+            stats.items(), key=lambda item: item[1].total_time, reverse=True
+        ):
+            logger.info(
+                "fingerprint=%s count=%d total_ms=%.1f p95_ms=%.1f rows=%d sql=%s",
+                fingerprint,
+                query.count,
+                query.total_time * 1000,
+                query.p95 * 1000,
+                query.rows,
+                query.sql,
+            )
+        for (path, fingerprint), (count, sql) in n_plus_one.items():
+            logger.warning(
+                "N+1 path=%s fingerprint=%s count=%d sql=%s",
+                path,
+                fingerprint,
+                count,
+                sql,
+            )
+
+
+class RequestQueryStats:
+    __slots__ = ("counts", "statements")
+
+    def __init__(self):
+        self.counts = {}
+        self.statements = {}
+
+    def add(self, fingerprint: str, sql: str):
+        self.counts[fingerprint] = self.counts.get(fingerprint, 0) + 1
+        self.statements[fingerprint] = sql
+
+
+collector = QueryStatsCollector(
+    flush_interval=settings.QUERY_STATS.get("FLUSH_INTERVAL", 60)
+)
+atexit.register(collector.flush)
+
+
+def instrument_query(execute, sql, params, many, context):
+    """
+    Execute wrapper timing the statements of sampled requests, installed on
+    every connection in `connection_created`.
+    """
+    request_stats = _request_stats.get()
+    if request_stats is None:
+        return execute(sql, params, many, context)
+
+    started_at = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started_at
+        normalized_sql = normalize_sql(sql)
+        fingerprint = fingerprint_sql(normalized_sql)
+        rows = getattr(context.get("cursor"), "rowcount", 0) or 0
+        collector.record(fingerprint, normalized_sql, duration, rows)
+        request_stats.add(fingerprint, normalized_sql)
+
+
+class QueryStatsMiddleware:
+    """
+    Samples `QUERY_STATS["SAMPLE_RATE"]` of the requests for query statistics
+    and flags statements repeated `N_PLUS_ONE_THRESHOLD` times or more in one
+    request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.QUERY_STATS.get("SAMPLE_RATE", 0.1)
+        self.n_plus_one_threshold = settings.QUERY_STATS.get(
+            "N_PLUS_ONE_THRESHOLD", 10
+        )
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        request_stats = RequestQueryStats()
+        token = _request_stats.set(request_stats)
+        try:
+            return self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+            self.check_n_plus_one(request, request_stats)
+
+    def check_n_plus_one(self, request, request_stats: RequestQueryStats):
+        # group by route so ids in the url do not split the same endpoint
+        path = getattr(request.resolver_match, "route", None) or request.path
+        for fingerprint, count in request_stats.counts.items():
+            if count >= self.n_plus_one_threshold:
+                collector.record_n_plus_one(
+                    path=path,
+                    fingerprint=fingerprint,
+                    sql=request_stats.statements[fingerprint],
+                    count=count,
+                )
@@ -1,37 +1,209 @@
 # import django
+import atexit
 import datetime
+import itertools
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import threading
 
-import json_log_formatter
-import ujson
+import orjson
 
 logging.addLevelName(logging.CRITICAL, "FATAL")
 
+# attributes every LogRecord carries, anything else was passed through `extra`
+RECORD_ATTRIBUTES = frozenset(logging.makeLogRecord({}).__dict__) | {
+    "message",
+    "asctime",
+}
 
-class CustomizedJSONFormatter(json_log_formatter.JSONFormatter):
-    json_lib = ujson
 
-    def json_record(self, message, extra, record):
-        extra["level"] = record.__dict__["levelname"]
-        extra["msg"] = message
-        extra["logger"] = record.__dict__["name"]
-        extra["func"] = record.__dict__["funcName"]
-        extra["time"] = datetime.datetime.now().isoformat()
+class CachedTimestampMixin:
+    """
+    Formats `record.created` as a local ISO-8601 timestamp, the part up to the
+    seconds is computed once per second.
+    """
 
-        request = extra.pop("request", None)
+    _second_cache = (None, "")
+
+    def format_timestamp(self, created: float) -> str:
+        second = int(created)
+        cached_second, prefix = self._second_cache
+        if cached_second != second:
+            prefix = datetime.datetime.fromtimestamp(second).isoformat()
+            self._second_cache = (second, prefix)
+        return f"{prefix}.{int((created - second) * 1000000):06d}"
+
+
+class CustomizedJSONFormatter(CachedTimestampMixin, logging.Formatter):
+    """
+    JSON formatter serializing with orjson. `static_fields` are merged into
+    every record, they are computed once when the formatter is configured.
+    """
+
+    def __init__(self, static_fields: dict = None):
+        super().__init__()
+        self.static_fields = dict(static_fields or {})
+
+    def format(self, record):
+        json_record = dict(self.static_fields)
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRIBUTES:
+                json_record[key] = value
+
+        json_record["level"] = record.levelname
+        json_record["msg"] = record.getMessage()
+        json_record["logger"] = record.name
+        json_record["func"] = record.funcName
+        json_record["time"] = self.format_timestamp(record.created)
+
+        request = json_record.pop("request", None)
         if request:
-            extra["x_forward_for"] = request.META.get("X-FORWARD-FOR")
-        return extra
+            json_record["x_forward_for"] = request.META.get("X-FORWARD-FOR")
+        return self.to_json(json_record)
+
+    def to_json(self, json_record: dict) -> str:
+        try:
+            return orjson.dumps(
+                json_record, default=str, option=orjson.OPT_NON_STR_KEYS
+            ).decode("utf-8")
+        except (TypeError, orjson.JSONEncodeError) as e:
+            # e.g. integers over 64 bit, keep the record without its extras
+            fallback_record = {
+                key: json_record.get(key)
+                for key in ("level", "msg", "logger", "func", "time")
+            }
+            fallback_record["serialization_error"] = str(e)
+            return json.dumps(fallback_record, default=str)
 
 
 # Create a custom log formatter that includes a counter
-class CounterLogFormatter(logging.Formatter):
+class CounterLogFormatter(CachedTimestampMixin, logging.Formatter):
     def __init__(self):
         super().__init__()
-        self.counter = 0
+        # next() on itertools.count is atomic, unlike `+= 1` on an attribute
+        self.counter = itertools.count(1)
 
     def format(self, record):
-        self.counter += 1
-        timestamp = datetime.datetime.fromtimestamp(record.created).isoformat()
-        msg = f"Log #{self.counter} - {record.levelname} - {timestamp} - {record.getMessage()}\n"
+        count = next(self.counter)
+        timestamp = self.format_timestamp(record.created)
+        msg = f"Log #{count} - {record.levelname} - {timestamp} - {record.getMessage()}\n"
         return msg
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to a bounded queue drained by a `QueueListener` thread,
+    the listener formats and writes them with `handlers`. In `LOGGING` they
+    are given as "cfg://handlers.<name>" references, which are only
+    resolved to handlers once configured: dictConfig configures handlers in
+    name order, so the queue handler's name must sort after its targets.
+
+    `overflow` decides what happens when the queue is full: "drop" discards
+    the record and counts it, "block" waits up to `block_timeout` seconds.
+    """
+
+    DROP = "drop"
+    BLOCK = "block"
+
+    def __init__(
+        self,
+        handlers: list,
+        maxsize: int = 10000,
+        overflow: str = DROP,
+        block_timeout: float = 1.0,
+    ):
+        super().__init__(queue.Queue(maxsize=maxsize))
+        # keeps the handlers alive, logging only holds weak references to
+        # handlers that are not attached to a logger. dictConfig resolves
+        # "cfg://" references on item access, not on iteration.
+        self.handlers = [handlers[index] for index in range(len(handlers))]
+        for handler in self.handlers:
+            if not isinstance(handler, logging.Handler):
+                raise ValueError(f"{handler!r} is not a configured handler")
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self.listener = None
+        self._listener_pid = None
+        self._listener_lock = threading.Lock()
+        atexit.register(self.stop_listener)
+
+    def start_listener(self):
+        """
+        The listener is (re)started per process, threads do not survive a
+        fork.
+        """
+        with self._listener_lock:
+            if self._listener_pid == os.getpid():
+                return
+            self.listener = DropReportingQueueListener(self, *self.handlers)
+            self.listener.start()
+            self._listener_pid = os.getpid()
+
+    def stop_listener(self):
+        """Drains the queue and flushes the handlers."""
+        with self._listener_lock:
+            if self.listener is None or self._listener_pid != os.getpid():
+                return
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.flush()
+            self.listener = None
+            self._listener_pid = None
+
+    def emit(self, record):
+        if self._listener_pid != os.getpid():
+            self.start_listener()
+        super().emit(record)
+
+    def prepare(self, record):
+        # the listener runs in this process, formatting is left to its thread
+        return record
+
+    def enqueue(self, record):
+        try:
+            if self.overflow == self.BLOCK:
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def close(self):
+        self.stop_listener()
+        super().close()
+
+
+class DropReportingQueueListener(logging.handlers.QueueListener):
+    """Writes a warning to the handlers when the queue handler dropped records."""
+
+    def __init__(self, queue_handler: BoundedQueueHandler, *handlers):
+        super().__init__(queue_handler.queue, *handlers, respect_handler_level=True)
+        self.queue_handler = queue_handler
+        self.reported_dropped = 0
+
+    def enqueue_sentinel(self):
+        # wait for room, the default put_nowait fails on a full queue
+        self.queue.put(self._sentinel)
+
+    def handle(self, record):
+        dropped = self.queue_handler.dropped
+        if dropped > self.reported_dropped:
+            super().handle(
+                logging.makeLogRecord(
+                    {
+                        "name": __name__,
+                        "levelno": logging.WARNING,
+                        "levelname": logging.getLevelName(logging.WARNING),
+                        "msg": "Log queue full, dropped %d records",
+                        "args": (dropped - self.reported_dropped,),
+                    }
+                )
+            )
+            self.reported_dropped = dropped
+        super().handle(record)
@@ -0,0 +1,224 @@
+import datetime
+import gc
+import json
+import logging
+import logging.config
+import threading
+
+from django.test import SimpleTestCase
+
+from .models import AttributeLogger
+from .query_stats import QueryStats, normalize_sql
+from .services import (
+    BoundedQueueHandler,
+    CounterLogFormatter,
+    CustomizedJSONFormatter,
+)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self, name, gate=None):
+        super().__init__()
+        self.name = name
+        self.records = []
+        self.gate = gate
+
+    def emit(self, record):
+        if self.gate:
+            self.gate.wait(timeout=5)
+        self.records.append(record.getMessage())
+
+
+class BoundedQueueHandlerTestCase(SimpleTestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("test_bounded_queue_handler")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+
+    def tearDown(self):
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+            handler.close()
+
+    def test_records_are_written_by_listener(self):
+        target = ListHandler("test_queue_target")
+        queue_handler = BoundedQueueHandler(handlers=[target])
+        self.logger.addHandler(queue_handler)
+
+        for index in range(10):
+            self.logger.info("message %s", index)
+        queue_handler.stop_listener()
+
+        self.assertListEqual(target.records, [f"message {i}" for i in range(10)])
+
+    def test_full_queue_drops_records(self):
+        gate = threading.Event()
+        target = ListHandler("test_queue_blocked_target", gate=gate)
+        queue_handler = BoundedQueueHandler(handlers=[target], maxsize=1)
+        self.logger.addHandler(queue_handler)
+
+        for index in range(10):
+            self.logger.info("message %s", index)
+        self.assertGreater(queue_handler.dropped, 0)
+
+        gate.set()
+        queue_handler.stop_listener()
+        self.assertTrue(
+            any(record.startswith("Log queue full") for record in target.records)
+        )
+
+    def test_configured_targets_are_kept_alive(self):
+        configurator = logging.config.DictConfigurator(
+            {
+                "version": 1,
+                "disable_existing_loggers": False,
+                "handlers": {
+                    "test_kept_alive_target": {
+                        "()": ListHandler,
+                        "name": "test_kept_alive_target",
+                    },
+                    "test_kept_alive_writer_queue": {
+                        "()": BoundedQueueHandler,
+                        "handlers": ["cfg://handlers.test_kept_alive_target"],
+                    },
+                },
+            }
+        )
+        # the handler loop of dictConfig, without closing the handlers of the
+        # rest of the test process
+        handlers = configurator.config["handlers"]
+        for name in sorted(handlers):
+            handlers[name] = configurator.configure_handler(handlers[name])
+            handlers[name].name = name
+        queue_handler = handlers["test_kept_alive_writer_queue"]
+        self.addCleanup(queue_handler.handlers[0].close)
+        del configurator, handlers
+        gc.collect()
+
+        self.logger.addHandler(queue_handler)
+        self.logger.info("message")
+        queue_handler.stop_listener()
+        self.assertListEqual(queue_handler.handlers[0].records, ["message"])
+
+
+class RecordHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class AttributeLoggerTestCase(SimpleTestCase):
+    def setUp(self):
+        self.handler = RecordHandler()
+        self.logger = logging.getLogger("test_attribute_logger")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+
+    def test_instances_are_independent(self):
+        log = AttributeLogger(self.logger, service="kpi")
+        other_log = AttributeLogger(self.logger)
+        user_log = log.with_attributes(user_id=1)
+
+        self.assertIsNot(log, other_log)
+        self.assertDictEqual(log.attributes, {"service": "kpi"})
+        self.assertDictEqual(user_log.attributes, {"service": "kpi", "user_id": 1})
+
+        user_log.info("message")
+        record = self.handler.records[0]
+        self.assertEqual(record.user_id, 1)
+        self.assertEqual(record.funcName, "test_instances_are_independent")
+
+    def test_disabled_level_is_skipped(self):
+        AttributeLogger(self.logger).debug("message")
+        self.assertListEqual(self.handler.records, [])
+
+    def test_bound_attributes_are_per_context(self):
+        log = AttributeLogger(self.logger)
+        barrier = threading.Barrier(2)
+
+        def request(user_id):
+            token = AttributeLogger.bind(user_id=user_id)
+            barrier.wait(timeout=5)
+            log.info("message")
+            AttributeLogger.unbind(token)
+
+        threads = [threading.Thread(target=request, args=(i,)) for i in (1, 2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertSetEqual({record.user_id for record in self.handler.records}, {1, 2})
+
+        log.info("message")
+        self.assertFalse(hasattr(self.handler.records[-1], "user_id"))
+
+
+class FormatterTestCase(SimpleTestCase):
+    def make_record(self, created):
+        record = logging.makeLogRecord(
+            {"name": "test", "levelname": "INFO", "msg": "hello %s", "args": ("kpi",)}
+        )
+        record.created = created
+        record.user_id = 1
+        return record
+
+    def test_json_formatter(self):
+        formatter = CustomizedJSONFormatter(static_fields={"service": "kpi"})
+        created = datetime.datetime(2024, 1, 2, 3, 4, 5, 678901).timestamp()
+
+        data = json.loads(formatter.format(self.make_record(created)))
+
+        self.assertEqual(data["msg"], "hello kpi")
+        self.assertEqual(data["level"], "INFO")
+        self.assertEqual(data["user_id"], 1)
+        self.assertEqual(data["service"], "kpi")
+        self.assertEqual(data["time"][:19], "2024-01-02T03:04:05")
+        self.assertNotIn("args", data)
+
+    def test_json_formatter_unserializable_extra(self):
+        formatter = CustomizedJSONFormatter()
+        record = self.make_record(0.0)
+        record.big_number = 2**70
+
+        data = json.loads(formatter.format(record))
+
+        self.assertEqual(data["msg"], "hello kpi")
+        self.assertEqual(data["level"], "INFO")
+        self.assertNotIn("big_number", data)
+        self.assertIn("serialization_error", data)
+
+    def test_counter_formatter(self):
+        formatter = CounterLogFormatter()
+        messages = [formatter.format(self.make_record(0.0)) for _ in range(3)]
+        self.assertTrue(messages[2].startswith("Log #3 - INFO"))
+
+
+class QueryStatsTestCase(SimpleTestCase):
+    def test_normalize_sql(self):
+        self.assertEqual(
+            normalize_sql(
+                "SELECT *  FROM kpi WHERE id IN (%s, %s, %s)\n AND name = 'x' LIMIT 21"
+            ),
+            "SELECT * FROM kpi WHERE id IN (?) AND name = ? LIMIT ?",
+        )
+        self.assertEqual(
+            normalize_sql("SELECT * FROM kpi WHERE id IN (%s)"),
+            normalize_sql("SELECT * FROM kpi WHERE id IN (%s, %s)"),
+        )
+
+    def test_query_stats(self):
+        stats = QueryStats("SELECT ?")
+        for duration in range(1, 101):
+            stats.add(duration / 1000, rows=2)
+
+        self.assertEqual(stats.count, 100)
+        self.assertEqual(stats.rows, 200)
+        self.assertAlmostEqual(stats.p95, 0.096)
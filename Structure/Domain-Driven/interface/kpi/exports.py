@@ -0,0 +1,43 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class Echo:
+    """Pseudo-buffer returning what is written, lets csv.writer feed a stream."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows, fields):
+    writer = csv.DictWriter(Echo(), fieldnames=fields, extrasaction="ignore")
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+def stream_export(rows, fields, export_format, filename):
+    if export_format == "csv":
+        lines = csv_lines(rows, fields)
+    else:
+        lines = ndjson_lines(rows)
+    response = StreamingHttpResponse(
+        lines, content_type=EXPORT_CONTENT_TYPES[export_format]
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{filename}.{export_format}"'
+    )
+    return response
@@ -163,6 +163,29 @@ company_id = OpenApiParameter(
     description="filter with company_id for success-manager",
 )
 
+cursor_param = OpenApiParameter(
+    name="cursor",
+    type=str,
+    location=OpenApiParameter.QUERY,
+    description="Opaque keyset cursor taken from the next/previous link.",
+)
+
+skip_count_param = OpenApiParameter(
+    name="skip_count",
+    type=str,
+    location=OpenApiParameter.QUERY,
+    description="Skip the total count query, count is returned as null.",
+    examples=[OpenApiExample("skip_count", value="true")],
+)
+
+export_format_param = OpenApiParameter(
+    name="export_format",
+    type=str,
+    location=OpenApiParameter.QUERY,
+    description="Format of the export file.",
+    examples=[OpenApiExample("export_format", value="csv, ndjson")],
+)
+
 
 kpi_create_extension = custom_extend_schema(
     tags=kpi_tags,
@@ -172,7 +195,7 @@ kpi_create_extension = custom_extend_schema(
 )
 absolute_kpi_listing = custom_extend_schema(
     tags=kpi_tags,
-    parameters=[company_id],
+    parameters=[company_id, cursor_param, skip_count_param],
     responses={200: KPIListSerializer},
     paginator=True,
 )
@@ -183,7 +206,9 @@ kpi_listing = custom_extend_schema(
     + [direct_report_param]
     + [kpi_responsible_person_param]
     + [kpi_sorting_param]
-    + [company_id],
+    + [company_id]
+    + [cursor_param]
+    + [skip_count_param],
     responses={200: CalculationBasedKPISerializer},
     paginator=True,
 )
@@ -215,7 +240,7 @@ get_frequency_for_absolute_kpi = custom_extend_schema(
 
 related_absolute_kpi_list = custom_extend_schema(
     tags=kpi_tags,
-    parameters=[company_id],
+    parameters=[company_id, cursor_param, skip_count_param],
     responses={200: {}},
     paginator=True,
 )
@@ -242,3 +267,13 @@ archive_kpi = custom_extend_schema(
     request=KpiArchiveSerializer,
     responses={200: {}},
 )
+
+kpi_export = custom_extend_schema(
+    tags=kpi_tags,
+    parameters=[year]
+    + [kpi_responsible_person_param]
+    + [frequency_filter_param]
+    + [company_id]
+    + [export_format_param],
+    responses={200: {}},
+)
@@ -1,4 +1,14 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import datetime
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class KPIPagination(PageNumberPagination):
@@ -11,3 +21,163 @@ class KPIPagination(PageNumberPagination):
         if extra_kwargs:
             response_data.update(extra_kwargs)
         return response_data
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a fixed, unique ordering.
+
+    Pages are located with a `WHERE (created_at, id) < (...)` style filter
+    instead of an OFFSET, so deep pages cost the same as the first one. The
+    cursor is an opaque base64 token holding the ordering values of the
+    boundary row and the direction to read in.
+
+    The response keeps the `count`, `next`, `previous` and `results` keys of
+    `PageNumberPagination`. Pass `skip_count=true` to avoid the `COUNT(*)`
+    query; `count` is then returned as `None`.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size = 5
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    skip_count_query_param = "skip_count"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = remove_query_param(request.build_absolute_uri(), "page")
+        self.page_size = self.get_page_size(request)
+        self.count = None if self.skip_count(request) else queryset.count()
+
+        position, forward = self.decode_cursor(request, queryset.model)
+        self.has_cursor = position is not None
+
+        ordering = self.ordering if forward else self._reverse_ordering()
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._build_keyset_q(position, forward))
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if not forward:
+            results.reverse()
+
+        self.page = results
+        self.has_next = has_more if forward else self.has_cursor
+        self.has_previous = self.has_cursor if forward else has_more
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("count", self.count),
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_modified_paginated_response(self, data, extra_kwargs: dict = {}):
+        response_data = self.get_paginated_response(data).data
+        if extra_kwargs:
+            response_data.update(extra_kwargs)
+        return response_data
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def skip_count(self, request) -> bool:
+        value = request.query_params.get(self.skip_count_query_param, "")
+        return value.lower() in ("1", "true")
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], forward=True)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], forward=False)
+
+    def encode_cursor(self, instance, forward: bool) -> str:
+        position = [
+            self._to_cursor_value(getattr(instance, field.lstrip("-")))
+            for field in self.ordering
+        ]
+        payload = json.dumps({"p": position, "f": forward}, separators=(",", ":"))
+        token = base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request, model):
+        """
+        Returns the boundary position and the direction of the cursor, values
+        are parsed with the ordering fields so a crafted cursor is a 404.
+        """
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, True
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+            position, forward = payload["p"], bool(payload["f"])
+            if not isinstance(position, list) or len(position) != len(self.ordering):
+                raise ValueError("cursor position does not match the ordering")
+            position = [
+                self._from_cursor_value(model, field, value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, forward
+
+    @staticmethod
+    def _from_cursor_value(model, field, value):
+        if value is None:
+            raise ValueError("cursor values cannot be null")
+        return model._meta.get_field(field.lstrip("-")).to_python(value)
+
+    @staticmethod
+    def _to_cursor_value(value):
+        # full isoformat keeps microseconds, DjangoJSONEncoder would drop them
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            return value.isoformat()
+        if isinstance(value, (int, float, str)) or value is None:
+            return value
+        return str(value)
+
+    def _reverse_ordering(self):
+        return tuple(
+            field[1:] if field.startswith("-") else f"-{field}"
+            for field in self.ordering
+        )
+
+    def _build_keyset_q(self, position, forward: bool) -> Q:
+        """
+        Expands the row comparison into the portable
+        `a < x OR (a = x AND b < y)` form.
+        """
+        keyset_q = Q()
+        for index, field in enumerate(self.ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") == forward else "gt"
+            equal_fields = {
+                previous.lstrip("-"): position[previous_index]
+                for previous_index, previous in enumerate(self.ordering[:index])
+            }
+            keyset_q |= Q(**equal_fields, **{f"{name}__{lookup}": position[index]})
+        return keyset_q
+
+
+class KPIKeysetPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
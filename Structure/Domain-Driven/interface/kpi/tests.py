@@ -1,3 +1,5 @@
+import base64
+import json
 import logging
 
 from faker import Faker
@@ -28,9 +30,11 @@ from focus_power.domain.role.user_role.models import RoleID, UserRoleFactory
 from focus_power.domain.user.models import UserBasePermissions, UserPersonalData
 from focus_power.domain.user.services import UserServices
 from focus_power.infrastructure.logger.models import AttributeLogger
+from rest_framework.request import Request
 from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
 from scripts.calender_generator import generate_ten_years_calendar_data
 
+from .pagination import KPIKeysetPagination
 from .views import KPIViewSet
 
 fake = Faker()
@@ -575,3 +579,104 @@ class KPIViewSetTestCase(APITestCase):
         )
 
         self.assertEquals(response.status_code, 404)
+
+    def test_keyset_pagination(self):
+        queryset = KPI.objects.all()
+        expected_ids = list(
+            queryset.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+        # walk forward through every page following the next links
+        seen_ids = []
+        url = "/api/v0/kpi/absolute_kpi_list/?page_size=2"
+        while url:
+            paginator = KPIKeysetPagination()
+            page = paginator.paginate_queryset(
+                queryset, Request(self.factory.get(url))
+            )
+            response_data = paginator.get_paginated_response([]).data
+            self.assertEquals(response_data.get("count"), len(expected_ids))
+            self.assertLessEqual(len(page), 2)
+            seen_ids += [kpi.id for kpi in page]
+            url = response_data.get("next")
+        self.assertListEqual(seen_ids, expected_ids)
+
+        # previous link of the second page returns the first page
+        paginator = KPIKeysetPagination()
+        paginator.paginate_queryset(
+            queryset,
+            Request(self.factory.get("/api/v0/kpi/absolute_kpi_list/?page_size=2")),
+        )
+        second_page_url = paginator.get_next_link()
+        paginator = KPIKeysetPagination()
+        paginator.paginate_queryset(queryset, Request(self.factory.get(second_page_url)))
+        previous_url = paginator.get_previous_link()
+        paginator = KPIKeysetPagination()
+        page = paginator.paginate_queryset(
+            queryset, Request(self.factory.get(previous_url))
+        )
+        self.assertListEqual([kpi.id for kpi in page], expected_ids[:2])
+        self.assertIsNone(paginator.get_previous_link())
+
+        # skip count mode
+        paginator = KPIKeysetPagination()
+        paginator.paginate_queryset(
+            queryset,
+            Request(self.factory.get("/api/v0/kpi/absolute_kpi_list/?skip_count=true")),
+        )
+        self.assertIsNone(paginator.get_paginated_response([]).data.get("count"))
+
+        # invalid cursor
+        request = self.factory.get("/api/v0/kpi/absolute_kpi_list/?cursor=invalid")
+        force_authenticate(request, user=self.user_obj)
+        response = self.kpi_view_set.as_view({"get": "absolute_kpi_list"})(request)
+        self.assertEquals(response.status_code, 404)
+
+        request = self.factory.get("/api/v0/kpi/?cursor=invalid")
+        force_authenticate(request, user=self.user_obj)
+        response = self.kpi_view_set.as_view({"get": "list"})(request)
+        self.assertEquals(response.status_code, 404)
+
+        # well-formed cursor with position values of the wrong type
+        for position in (["not-a-date", str(expected_ids[0])], [None, 1], [{}, []]):
+            payload = json.dumps({"p": position, "f": True}).encode("utf-8")
+            cursor = base64.urlsafe_b64encode(payload).decode("ascii")
+            request = self.factory.get(
+                f"/api/v0/kpi/absolute_kpi_list/?cursor={cursor}"
+            )
+            force_authenticate(request, user=self.user_obj)
+            response = self.kpi_view_set.as_view({"get": "absolute_kpi_list"})(
+                request
+            )
+            self.assertEquals(response.status_code, 404)
+
+    def test_export(self):
+        expected_count = KPIAppServices().list_all_kpi(user=self.user_obj).count()
+
+        request = self.factory.get("/api/v0/kpi/export/?export_format=csv")
+        force_authenticate(request, user=self.user_obj)
+        response = self.kpi_view_set.as_view({"get": "export"})(request)
+
+        self.assertEquals(response.status_code, 200)
+        self.assertEquals(response["Content-Type"], "text/csv")
+        lines = b"".join(response.streaming_content).decode("utf-8").splitlines()
+        self.assertTrue(lines[0].startswith("id,name,unit_type"))
+        self.assertEquals(len(lines) - 1, expected_count)
+
+        request = self.factory.get("/api/v0/kpi/export/?export_format=ndjson")
+        force_authenticate(request, user=self.user_obj)
+        response = self.kpi_view_set.as_view({"get": "export"})(request)
+
+        self.assertEquals(response.status_code, 200)
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+        self.assertEquals(len(rows), expected_count)
+
+        # unsupported format
+        request = self.factory.get("/api/v0/kpi/export/?export_format=xlsx")
+        force_authenticate(request, user=self.user_obj)
+        response = self.kpi_view_set.as_view({"get": "export"})(request)
+
+        self.assertEquals(response.status_code, 400)
@@ -11,15 +11,17 @@ from focus_power.interface.access_control.middleware_adapter import (
 )
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from utils.django.exceptions import KPIsException
 
 from . import open_api
+from .exports import EXPORT_CONTENT_TYPES, stream_export
 
 # local imports
 from .filters import KPIFilters
-from .pagination import KPIPagination
+from .pagination import KPIKeysetPagination, KPIPagination
 from .serializers import (
     CalculationBasedKPISerializer,
     KpiArchiveSerializer,
@@ -47,6 +49,7 @@ from .serializers import (
     update_reporting_person=open_api.update_reporting_person,
     delete_kpi=open_api.delete_kpi,
     archive_kpi=open_api.archive_kpi,
+    export=open_api.kpi_export,
 )
 class KPIViewSet(viewsets.ViewSet):
     """
@@ -56,9 +59,22 @@ class KPIViewSet(viewsets.ViewSet):
     authentication_classes = (JWTAuthentication,)
     permission_classes = (IsAuthenticated,)
     pagination_class = KPIPagination
+    keyset_pagination_class = KPIKeysetPagination
+    legacy_pagination_params = ("page", "sort_by")
     filter_class = KPIFilters
+    export_chunk_size = 500
     access_control = get_access_controller()
 
+    def get_paginator(self):
+        """
+        Keyset pagination is used unless the client asks for a page number or
+        a custom ordering, which only the page-number paginator can serve.
+        """
+        query_params = self.request.query_params
+        if any(param in query_params for param in self.legacy_pagination_params):
+            return self.pagination_class()
+        return self.keyset_pagination_class()
+
     @access_control()
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -199,7 +215,7 @@ class KPIViewSet(viewsets.ViewSet):
             user=self.request.user,
             company_id=self.request.query_params.get("company_id"),
         ).order_by("-created_at")
-        paginator = self.pagination_class()
+        paginator = self.get_paginator()
         paginated_queryset = paginator.paginate_queryset(queryset, request)
         serializer_data = serializer(
             paginated_queryset,
@@ -214,6 +230,60 @@ class KPIViewSet(viewsets.ViewSet):
         message = "Successfully listed all absolute KPIs."
         return APIResponse(data=paginated_data, message=message)
 
+    @action(detail=False, methods=["get"], name="export")
+    @access_control()
+    def export(self, request):
+        """
+        Streams the yearly and YTD rollup of the KPIs as CSV or NDJSON,
+        KPIs are read and rolled up in batches so memory stays bounded.
+        """
+        export_format = self.request.query_params.get("export_format", "csv")
+        if export_format not in EXPORT_CONTENT_TYPES:
+            return APIResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                errors={"export_format": list(EXPORT_CONTENT_TYPES)},
+                message="Invalid export format",
+                for_error=True,
+            )
+        try:
+            kpi_app_services = KPIAppServices()
+            queryset = kpi_app_services.list_all_kpi(
+                user=self.request.user,
+                company_id=self.request.query_params.get("company_id"),
+            )
+            filtered_queryset = self.filter_class(
+                self.request.query_params, queryset=queryset
+            ).qs
+            year, _, _, _ = kpi_app_services.get_last_date(
+                query_params=self.request.query_params
+            )
+            kpi_frequency_app_service = KPIFrequencyAppServices(user=self.request.user)
+            rows = kpi_frequency_app_service.iter_kpi_export_rows(
+                kpi_queryset=filtered_queryset,
+                year=year,
+                chunk_size=self.export_chunk_size,
+            )
+            return stream_export(
+                rows=rows,
+                fields=kpi_frequency_app_service.export_fields,
+                export_format=export_format,
+                filename=f"kpis-{year}",
+            )
+        except settings.LAZY_EXCEPTIONS as une:
+            return APIResponse(
+                status_code=une.status_code,
+                errors=une.error_data(),
+                message=une.message,
+                for_error=True,
+            )
+        except Exception as e:
+            return APIResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                errors=e.args,
+                for_error=True,
+                general_error=True,
+            )
+
     @access_control(direct_report_required=True)
     def list(self, request):
         try:
@@ -228,7 +298,7 @@ class KPIViewSet(viewsets.ViewSet):
             filtered_queryset = self.filter_class(
                 self.request.query_params, queryset=queryset
             ).qs
-            paginator = self.pagination_class()
+            paginator = self.get_paginator()
             paginated_queryset = paginator.paginate_queryset(filtered_queryset, request)
             year, month, last_date, current_week = kpi_app_services.get_last_date(
                 query_params=self.request.query_params
@@ -252,6 +322,9 @@ class KPIViewSet(viewsets.ViewSet):
             )
             message = "Successfully listed all KPIs."
             return APIResponse(data=paginated_data, message=message)
+        except NotFound:
+            # invalid cursor, 404 like the other paginated actions
+            raise
         except settings.LAZY_EXCEPTIONS as une:
             return APIResponse(
                 status_code=une.status_code,
@@ -319,7 +392,7 @@ class KPIViewSet(viewsets.ViewSet):
         queryset = relative_kpi_app_service.list_relative_kpis(
             user=self.request.user, kpi_id=pk
         ).order_by("-created_at")
-        paginator = self.pagination_class()
+        paginator = self.get_paginator()
         paginated_queryset = paginator.paginate_queryset(queryset, request)
         kpi_app_services = KPIAppServices()
         year, month, last_date, current_week = kpi_app_services.get_last_date(
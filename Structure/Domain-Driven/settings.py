@@ -19,6 +19,7 @@ from pathlib import Path
 from dotenv import load_dotenv
 from focus_power.infrastructure.logger.models import AttributeLogger
 from focus_power.infrastructure.logger.services import (
+    BoundedQueueHandler,
     CounterLogFormatter,
     CustomizedJSONFormatter,
 )
@@ -113,6 +114,7 @@ MIDDLEWARE = [
     "debug_toolbar.middleware.DebugToolbarMiddleware",
     "focus_power.infrastructure.middlewares.api_response_middleware.CustomResponseMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    "focus_power.infrastructure.logger.query_stats.QueryStatsMiddleware",
 ]
 
 ROOT_URLCONF = "focus_power.interface.urls"
@@ -186,6 +188,9 @@ LOGGER_HANDLERS = os.getenv(
         "error_file",
     ],
 ).split(",")
+# records are written by a background listener thread, see BoundedQueueHandler
+LOGGER_QUEUE_SIZE = int(os.getenv("LOGGER_QUEUE_SIZE", 10000))
+LOGGER_QUEUE_OVERFLOW = os.getenv("LOGGER_QUEUE_OVERFLOW", "drop")
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -236,6 +241,13 @@ LOGGING = {
             "class": "logging.StreamHandler",
             "formatter": "json",
         },
+        # configured in name order, must sort after the handlers it writes to
+        "writer_queue": {
+            "()": BoundedQueueHandler,
+            "handlers": [f"cfg://handlers.{name}" for name in LOGGER_HANDLERS],
+            "maxsize": LOGGER_QUEUE_SIZE,
+            "overflow": LOGGER_QUEUE_OVERFLOW,
+        },
         "db_query_file": {
             "level": "DEBUG",
             "class": "logging.FileHandler",
@@ -245,13 +257,13 @@ LOGGING = {
     },
     "loggers": {
         "": {
-            "handlers": LOGGER_HANDLERS,
+            "handlers": ["writer_queue"],
             "level": "DEBUG",
             "propagate": False,
         },
-        "django.db.backends": {
+        "focus_power.query_stats": {
             "handlers": ["db_query_file"],
-            "level": "DEBUG",
+            "level": "INFO",
             "propagate": False,
         },
     },
@@ -411,12 +423,23 @@ LOWEST_PROGRESS_THRESHOLD = float(os.getenv("LOWEST_PROGRESS_THRESHOLD"))
 COMMON_DATE_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
 
 
+# SQL statements of sampled requests are aggregated by fingerprint and the
+# summary is written to db_query_file every FLUSH_INTERVAL seconds
+QUERY_STATS = {
+    "SAMPLE_RATE": float(os.getenv("QUERY_STATS_SAMPLE_RATE", 0.1)),
+    "FLUSH_INTERVAL": int(os.getenv("QUERY_STATS_FLUSH_INTERVAL", 60)),
+    "N_PLUS_ONE_THRESHOLD": int(os.getenv("QUERY_STATS_N_PLUS_ONE_THRESHOLD", 10)),
+}
+
 from django.db.backends.signals import connection_created
 
 
-# Set up a listener to connect the logger to the database
+# Set up a listener to instrument the queries of every connection
 def connect_db_logger(sender, connection, **kwargs):
-    connection.use_debug_cursor = True
+    from focus_power.infrastructure.logger.query_stats import instrument_query
+
+    if instrument_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(instrument_query)
 
 
 connection_created.connect(connect_db_logger)
@@ -1,16 +1,24 @@
-from core.caches import CacheBase
+from core.caches import RateLimitCache
+from django.conf import settings
 
 
-class PhonenumberVerificationCache(CacheBase):
+class PhonenumberVerificationCache(RateLimitCache):
+    """
+    Verification codes sent per phonenumber over the last 24 hours, cleared
+    once a code is confirmed.
+    """
+
     expire_duration = 60 * 60 * 24
-    key_prefix = "phonenumberverification"
+    # "phonenumberverification" held the old integer counters, reading them
+    # as a sorted set fails with WRONGTYPE
+    key_prefix = "phonenumberverificationwindow"
 
-    def incr(self, phonenumber, delta=1):
-        key = self._format_key(phonenumber)
-        try:
-            self.cache.incr(key, delta)
-        except ValueError:
-            self.cache_set(phonenumber, 1)
+    def attempt(self, phonenumber):
+        """Records a verification request, `False` once the daily limit is hit."""
+        allowed, _, _ = self.hit(
+            phonenumber, settings.PHONENUMBER_DAILY_SIGNIN_LIMIT, self.expire_duration
+        )
+        return allowed
 
     def get(self, phonenumber, *args, **kwargs):
-        return self.cache_get(phonenumber)
+        return self.count(phonenumber, self.expire_duration)
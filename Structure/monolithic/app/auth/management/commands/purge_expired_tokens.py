@@ -0,0 +1,24 @@
+from core.tokens import purge_expired_tokens, sync_revoked_tokens
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired outstanding and blacklisted tokens in chunks. "
+        "Run it on a schedule, e.g. daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--sync",
+            action="store_true",
+            help="Also warm the revoked token cache with the blacklisted tokens.",
+        )
+
+    def handle(self, *args, **options):
+        deleted, counts = purge_expired_tokens(chunk_size=options["chunk_size"])
+        self.stdout.write(f"Deleted {deleted} expired tokens {counts}")
+        if options["sync"]:
+            synced = sync_revoked_tokens(chunk_size=options["chunk_size"])
+            self.stdout.write(f"Synced {synced} revoked tokens")
@@ -2,8 +2,9 @@
 import datetime
 from random import randint
 
+from core.bulk_writer import bulk_create_writer
 from django.conf import settings
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.utils import timezone
 from phonenumber_field.modelfields import PhoneNumberField
 
@@ -23,22 +24,45 @@ class PhonenumberCheck(models.Model):
         app_label = "mmd_auth"
         db_table = "mmd_auth_phonenumber_check"
 
-    def attempt_verification(self):
-        # generate token
-        token = "1234" if settings.ENV not in ["prod"] else randint(1000, 10000)
+    @staticmethod
+    def generate_token():
+        return "1234" if settings.ENV not in ["prod"] else randint(1000, 10000)
+
+    @classmethod
+    def request_verification(cls, phonenumber):
+        """
+        Stores a new token for `phonenumber` and sends it once the token is
+        committed. Known phonenumbers take a single UPDATE, the row is only
+        created on the first request.
+
+        Returns the expiration time of the token.
+        """
+        token = cls.generate_token()
+        timestamp_requested = timezone.now()
+        for _ in range(2):
+            updated = cls.objects.filter(phonenumber=phonenumber).update(
+                token=token, verified=False, timestamp_requested=timestamp_requested
+            )
+            if updated:
+                break
+            try:
+                with transaction.atomic():
+                    # auto_now_add sets its own timestamp_requested
+                    timestamp_requested = cls.objects.create(
+                        phonenumber=phonenumber, token=token
+                    ).timestamp_requested
+                break
+            except IntegrityError:
+                # created by a concurrent request, updated on the next pass
+                continue
+        else:
+            raise IntegrityError(f"phonenumber check of {phonenumber} not stored")
 
-        # send verification code using event emitter
         # TODO: logic needs to be implemented in AWS using lambda
-        AuthEventsEmitter().send_verification_code(token, str(self.phonenumber))
-
-        self.timestamp_requested = timezone.now()
-        self.token = token
-        self.verified = False
-        self.save()
-
-        from auth.caches import PhonenumberVerificationCache
-
-        PhonenumberVerificationCache().incr(str(self.phonenumber))
+        AuthEventsEmitter().send_verification_code(token, str(phonenumber))
+        return timestamp_requested + datetime.timedelta(
+            minutes=settings.PHONENUMBER_EXPIRATION
+        )
 
     def confirm_verification(self, token):
         if self.token == token:
@@ -74,6 +98,16 @@ class PhonenumberVerificationLog(models.Model):
         app_label = "mmd_auth"
         db_table = "mmd_auth_phonenumber_verification_log"
 
+    @classmethod
+    def log(cls, phonenumber, type, success=None):
+        """Queues the row for `verification_log_writer`, written in batches."""
+        verification_log_writer.append(
+            cls(phonenumber=phonenumber, type=type, success=success)
+        )
+
+
+verification_log_writer = bulk_create_writer(PhonenumberVerificationLog)
+
 
 class AllowedPhonenumbers(models.Model):
     phonenumber = models.CharField(max_length=32, help_text="bypass phonenumber")
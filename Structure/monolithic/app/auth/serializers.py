@@ -3,6 +3,7 @@ import logging
 
 from allauth.account.adapter import get_adapter
 from auth.caches import PhonenumberVerificationCache
+from core.tokens import RevocableRefreshToken
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.utils.translation import ugettext_lazy as _
@@ -11,7 +12,7 @@ from rest_auth.serializers import LoginSerializer
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from rest_framework_simplejwt.settings import api_settings
-from rest_framework_simplejwt.tokens import RefreshToken
+from user.utils_user import get_proxy_userprofile_model
 
 from .models import PhonenumberCheck, PhonenumberVerificationLog
 from .utils_auth import bypass_token_request, is_banned_phonenumber
@@ -50,17 +51,20 @@ class BaseSignupSerializer(serializers.Serializer):
 
 class SignupSerializer(BaseSignupSerializer):
     def create_profile(self, request, user):
-        user.profile.fullname = self.validated_data.get("fullname", "")
+        fields = {"fullname": self.validated_data.get("fullname", "")}
         if user.type == CustomUser.Types.DRIVER:
-            user.profile.dob = self.validated_data.get("dob", None)
-        user.profile.save()
+            fields["dob"] = self.validated_data.get("dob", None)
+        # also caches the profile on `user.profile`
+        return get_proxy_userprofile_model(user).objects.create(user=user, **fields)
 
     def save(self, request):
         user_type = self.validated_data.get("user_type", CustomUser.Types.STAFF)
         adapter = get_adapter()
         user = adapter.new_user(request, user_type=user_type)
-        adapter.save_user(request, user, self.validated_data)
-        self.create_profile(request, user)
+        # the profile is created with its fields below instead of by the adapter
+        adapter.save_user(request, user, self.validated_data, commit=False)
+        user.save()
+        self.profile = self.create_profile(request, user)
 
         # import other domain module
         from user.events import UserEventsEmitter
@@ -73,7 +77,7 @@ class SignupSerializer(BaseSignupSerializer):
 class TokenObtainPairFromUserSerializer(serializers.Serializer):
     @classmethod
     def get_token(cls, user):
-        return RefreshToken.for_user(user)
+        return RevocableRefreshToken.for_user(user)
 
     def validate(self, attrs):
         data = {}
@@ -162,7 +166,7 @@ class SigninTokenConfirmSerializer(LoginSerializer):
         phonenumber = attrs.get("phonenumber")
         token = attrs.get("token")
         is_verified = self.verify_token(phonenumber, token)
-        PhonenumberVerificationLog.objects.create(
+        PhonenumberVerificationLog.log(
             phonenumber=phonenumber,
             type=PhonenumberVerificationLog.VerificationType.SIGNIN,
             success=is_verified,
@@ -186,7 +190,7 @@ class SignoutTokenRefreshSerializer(TokenRefreshSerializer):
     refresh = serializers.CharField(help_text="refresh_token")
 
     def validate(self, attrs):
-        refresh = RefreshToken(attrs["refresh"])
+        refresh = RevocableRefreshToken(attrs["refresh"])
 
         data = {"access": str(refresh.access_token)}
         if (
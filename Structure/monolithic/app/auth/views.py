@@ -8,13 +8,13 @@ from core.throttling import (
     AuthCheckThrottle,
     SMSRequestThrottle,
 )
+from core.tokens import purge_expired_tokens, revoke_token
 from django.conf import settings
 from django.contrib.auth import get_user_model, logout
 from django.utils import timezone
 from drf_spectacular.utils import extend_schema
 from rest_auth.registration.views import LoginView, RegisterView
 from rest_framework import generics, permissions, status
-from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 
@@ -67,9 +67,6 @@ class BaseSignupView(RegisterView):
     throttle_classes = [AnonSuppressedThrottle]
 
     def get_response_data(self, user):
-        phonenumber = self.request.data["phonenumber"]
-        user = get_object_or_404(USER, phonenumber=phonenumber)
-
         serializer = TokenObtainPairFromUserSerializer(
             data={}, context={"request": self.request, "user": user}
         )
@@ -82,7 +79,7 @@ class BaseSignupView(RegisterView):
         ret = dict()
         from user.caches import UserProfileCache
 
-        up = UserProfileCache().get(user.uuid)
+        up = UserProfileCache().prime(user, self.profile)
 
         ret["uuid"] = user.uuid
 
@@ -95,7 +92,7 @@ class BaseSignupView(RegisterView):
         complete_signup(
             self.request._request, user, allauth_settings.EMAIL_VERIFICATION, None
         )
-        up = {"uuid": user.uuid, "fullname": user.profile.fullname}  # noqa: F841
+        self.profile = serializer.profile
         return user
 
 
@@ -156,28 +153,17 @@ class SigninTokenRequestView(generics.GenericAPIView):
         phonenumber = serializer.data["phonenumber"]
 
         if not bypass_token_request(phonenumber):
-            phonenumber_check, created = PhonenumberCheck.objects.get_or_create(
-                phonenumber=phonenumber
-            )
-            verification_success_count = PhonenumberVerificationCache().get(phonenumber)
-            verification_success_count = int(verification_success_count or 0)
-            # print(verification_success_count)
-            if verification_success_count >= settings.PHONENUMBER_DAILY_SIGNIN_LIMIT:
+            if not PhonenumberVerificationCache().attempt(phonenumber):
                 return Response(
                     "This number is blocked for 24 hours",
                     status=status.HTTP_429_TOO_MANY_REQUESTS,
                 )
 
-            phonenumber_check.attempt_verification()
-            PhonenumberVerificationLog.objects.create(
+            timestamp_expires = PhonenumberCheck.request_verification(phonenumber)
+            PhonenumberVerificationLog.log(
                 phonenumber=phonenumber,
                 type=PhonenumberVerificationLog.VerificationType.SIGNIN,
             )
-            timestamp_expires = (
-                None
-                if phonenumber_check is None
-                else phonenumber_check.get_expiration_time()
-            )
             return Response(
                 {"timestamp_expires": timestamp_expires}, status=status.HTTP_200_OK
             )
@@ -239,6 +225,9 @@ class UnregisterView(generics.GenericAPIView):
         except TokenError as e:  # noqa: F841
             pass
 
+        if request.auth is not None:
+            revoke_token(request.auth)
+
         user = request.user
         user.date_unregistered = timezone.now()
         user.save()
@@ -260,6 +249,8 @@ class SignoutView(generics.GenericAPIView):
         except TokenError as e:  # noqa: F841
             pass
 
+        if request.auth is not None:
+            revoke_token(request.auth)
         logout(request)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -271,6 +262,9 @@ class TokenHeartbeatView(generics.GenericAPIView):
     def post(self, request, *args, **kwargs):
         """
         Delete expired tokens and return their count.
+
+        Kept for existing callers, the `purge_expired_tokens` management
+        command is the scheduled way to do this.
         """
         from rest_framework_simplejwt.settings import api_settings
 
@@ -278,12 +272,7 @@ class TokenHeartbeatView(generics.GenericAPIView):
             api_settings.BLACKLIST_AFTER_ROTATION
             and "rest_framework_simplejwt.token_blacklist" in settings.INSTALLED_APPS
         ):
-            from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
-            from rest_framework_simplejwt.utils import aware_utcnow
-
-            delete_count = OutstandingToken.objects.filter(
-                expires_at__lte=aware_utcnow()
-            ).delete()
+            delete_count = purge_expired_tokens()
             return Response({"delete_count": delete_count}, status=status.HTTP_200_OK)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -15,20 +15,28 @@ class AuthenticationBackend(ModelBackend):
         password = credentials.get("password")
 
         if phonenumber:
-            # import module from different domain
-            from user.selectors import user_selector
-
-            for user in user_selector.filter_users_by_phonenumber(phonenumber):
-                if self._check_password(user, password):
-                    return user
+            user = self._get_user_by_phonenumber(phonenumber)
+            if user and self._check_password(user, password):
+                return user
         return None
 
+    @staticmethod
+    def _get_user_by_phonenumber(phonenumber):
+        # import module from different domain
+        from user.selectors import user_selector
+
+        return user_selector.get_user_by_phonenumber(phonenumber)
+
     def _check_password(self, user, password):
         ret = user.check_password(password)
         if ret:
-            ret = self.user_can_authenticate(user)
-            if not ret:
-                self._stash_user(user)
+            ret = self._check_user_can_authenticate(user)
+        return ret
+
+    def _check_user_can_authenticate(self, user):
+        ret = self.user_can_authenticate(user)
+        if not ret:
+            self._stash_user(user)
         return ret
 
     @classmethod
@@ -67,9 +75,7 @@ class AuthenticationBackend(ModelBackend):
 class PasswordlessAuthenticationBackend(AuthenticationBackend):
     def authenticate(self, request, phonenumber, verification_success: bool):
         if phonenumber and verification_success:
-            from user.selectors import user_selector
-
-            for user in user_selector.filter_users_by_phonenumber(phonenumber):
-                if self.user_can_authenticate(user):
-                    return user
+            user = self._get_user_by_phonenumber(phonenumber)
+            if user and self.user_can_authenticate(user):
+                return user
         return None
@@ -1,26 +1,41 @@
-from django.contrib.auth import get_user_model
 from django.utils.translation import ugettext_lazy as _
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
 from rest_framework_simplejwt.settings import api_settings
 
-User = get_user_model()
+from .caches import UserPrincipal, UserPrincipalCache
+from .tokens import RevokedTokenCache
 
 
 class MMDJWTAuthentication(JWTAuthentication):
+    def get_validated_token(self, raw_token):
+        """
+        Validates the token and rejects it when it was revoked on signout.
+
+        Access tokens are only revoked in the cache and stay valid if their
+        entry is lost. Refresh tokens fall back to the blacklist table.
+        """
+        validated_token = super().get_validated_token(raw_token)
+        if RevokedTokenCache().is_revoked(validated_token[api_settings.JTI_CLAIM]):
+            raise InvalidToken(_("Token is revoked"))
+        return validated_token
+
     def get_user(self, validated_token):
         """
         Attempts to find and return a user using the given validated token.
+
+        The user is resolved from `UserPrincipalCache`, the users table is only
+        read on a cache miss or when the view needs more than the snapshot.
         """
         try:
             user_id = validated_token[api_settings.USER_ID_CLAIM]
         except KeyError:
             raise InvalidToken(_("Token contained no recognizable user identification"))
 
-        try:
-            user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
-        except User.DoesNotExist:
+        snapshot = UserPrincipalCache().get(user_id)
+        if snapshot is None:
             raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        user = UserPrincipal(snapshot)
 
         if user.banned:
             raise AuthenticationFailed(
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger("django.eventlogger")
+
+
+class BulkCreateWriter:
+    """
+    Appends rows of write-only tables off the request thread. Queued
+    instances are written by a background thread with one `bulk_create` per
+    `batch_size` rows, at least every `flush_interval` seconds.
+
+    `auto_now_add` fields are set when the batch is written. Rows still
+    queued when the process is killed are lost, so only use it for logs.
+    At most `max_pending` rows are queued, newer ones are dropped and logged.
+    """
+
+    def __init__(
+        self,
+        model,
+        batch_size=500,
+        flush_interval=1.0,
+        buffered=True,
+        max_pending=10000,
+    ):
+        self.model = model
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # write on the calling thread, used in tests
+        self.buffered = buffered
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.worker_pid = None
+        self.worker_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def append(self, instance):
+        if not self.buffered:
+            self.write([instance])
+            return
+        try:
+            self.queue.put_nowait(instance)
+        except queue.Full:
+            logger.error(f"bulk write queue full, {self.model._meta.label} dropped")
+        self.start_worker()
+
+    def start_worker(self):
+        # threads do not survive a fork, start one per process
+        if self.worker_pid == os.getpid():
+            return
+        with self.worker_lock:
+            if self.worker_pid == os.getpid():
+                return
+            self.worker_pid = os.getpid()
+        threading.Thread(target=self.run_worker, daemon=True).start()
+
+    def run_worker(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self.write(batch)
+            close_old_connections()
+
+    def flush(self):
+        """Writes everything queued on the calling thread."""
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            self.write(batch)
+
+    def write(self, batch):
+        try:
+            self.model.objects.bulk_create(batch, batch_size=self.batch_size)
+        except Exception as e:
+            logger.error(
+                f"bulk write error {self.model._meta.label} {len(batch)} rows: {e}"
+            )
+
+
+def bulk_create_writer(model):
+    return BulkCreateWriter(
+        model,
+        batch_size=settings.BULK_WRITER_BATCH_SIZE,
+        flush_interval=settings.BULK_WRITER_FLUSH_INTERVAL,
+        max_pending=settings.BULK_WRITER_MAX_PENDING,
+        buffered=settings.ENV not in ["test"],
+    )
@@ -1,3 +1,9 @@
 from .cache_base import CacheBase, NewBadgeCache  # noqa: F403, F401
 from .model_cache_base import ModelCacheBase  # noqa: F403, F401
-from .pagination_cache import PaginationCache  # noqa: F403, F401
+from .pagination_cache import (  # noqa: F403, F401
+    PaginationCache,
+    PaginationCountCache,
+    bump_pagination_count_version,
+)
+from .rate_limit_cache import RateLimitCache  # noqa: F403, F401
+from .user_principal_cache import UserPrincipal, UserPrincipalCache  # noqa: F403, F401
@@ -1,6 +1,8 @@
 from django.conf import settings
 from django.core.cache import cache, caches
 
+from ..profiler import record_cache_access
+
 DEFAULT_CACHE_ALIAS = "default"
 
 
@@ -43,6 +45,10 @@ class CacheBase:
     def cache_get(self, key):
         key = self._format_key(key)
         data = self.cache.get(key)
+        if data is None:
+            record_cache_access(self.key_prefix, misses=1)
+        else:
+            record_cache_access(self.key_prefix, hits=1)
         return data
 
     def cache_get_many(self, *args):
@@ -52,6 +58,9 @@ class CacheBase:
             key_list = self._args_format_key_list(*args)
             result = self.cache.get_many(key_list)
             missing = [key for key in args if self._format_key(key) not in result]
+            record_cache_access(
+                self.key_prefix, hits=len(result), misses=len(missing)
+            )
             return result, missing
 
     def cache_set(self, key, value, expire_duration=None):
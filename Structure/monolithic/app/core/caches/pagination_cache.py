@@ -1,8 +1,30 @@
+import threading
+import time
+from uuid import uuid4
+
+from django.db import connections
+
 from .cache_base import CacheBase
 
 
 class PaginationCache(CacheBase):
+    """
+    Caches an ordered list of item keys and serves pages out of it.
+
+    Every rebuild of the list is stored as a new snapshot. The snapshot id is
+    returned by `get_page` and can be passed back on later pages so a client
+    keeps scrolling through the same list while newer snapshots are built.
+    Snapshots older than `refresh_ahead` seconds are rebuilt in a background
+    thread, callers keep reading the current one in the meantime.
+
+    On Redis the snapshot is stored as a list and a page reads only its own
+    slice with `LRANGE`.
+    """
+
     expire_duration = 60
+    # how long a snapshot stays readable for clients still paging through it
+    snapshot_expire_duration = 60 * 5
+    refresh_ahead = 45
 
     def __init__(self):
         super().__init__()
@@ -14,19 +36,139 @@ class PaginationCache(CacheBase):
         raise NotImplementedError("get_item is not implemented.")
 
     def get(self, key, page_num, page_size=50, *args, **kwargs):
+        result, _ = self.get_page(key, page_num, page_size, None, *args, **kwargs)
+        return result
+
+    def get_page(
+        self, key, page_num, page_size=50, snapshot_id=None, *args, **kwargs
+    ):
         page_num = max(int(page_num), 1)
         page_size = max(int(page_size), 1)
+        start = page_size * (page_num - 1)
+        end = start + page_size
 
-        result = []
+        uuid_list = None
+        if snapshot_id:
+            uuid_list = self._read_snapshot(key, snapshot_id, start, end)
 
-        uuid_list = self.cache_get(key)
         if uuid_list is None:
-            uuid_list = self.get_from_db(key, *args, **kwargs)
-            self.cache_set(key, uuid_list)
+            snapshot = self.cache_get(self._current_key(key))
+            if snapshot is None:
+                snapshot = self.build_snapshot(key, *args, **kwargs)
+            elif time.time() - snapshot["created_at"] > self.refresh_ahead:
+                self.refresh_in_background(key, *args, **kwargs)
+            snapshot_id = snapshot["id"]
+            uuid_list = self._read_snapshot(key, snapshot_id, start, end) or []
 
-        start = page_size * (page_num - 1)
-        end = start + page_size
-        for uuid in uuid_list[start:end]:
-            result.append(self.get_item(uuid))
+        result = [self.get_item(item_key) for item_key in uuid_list]
+        return result, snapshot_id
 
-        return result
+    def build_snapshot(self, key, *args, **kwargs):
+        uuid_list = self.get_from_db(key, *args, **kwargs)
+        uuid_list = [str(item_key) for item_key in uuid_list]
+        snapshot = {
+            "id": uuid4().hex,
+            "created_at": time.time(),
+            "size": len(uuid_list),
+        }
+        self._write_snapshot(key, snapshot["id"], uuid_list)
+        self.cache_set(self._current_key(key), snapshot)
+        return snapshot
+
+    def refresh_in_background(self, key, *args, **kwargs):
+        # only one worker rebuilds a given list at a time
+        lock_key = self._format_key((key, "refresh"))
+        if not self.cache.add(lock_key, 1, self.expire_duration):
+            return
+
+        def refresh():
+            try:
+                self.build_snapshot(key, *args, **kwargs)
+            finally:
+                self.cache.delete(lock_key)
+                connections.close_all()
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _current_key(self, key):
+        return (key, "current")
+
+    def _snapshot_key(self, key, snapshot_id):
+        return (key, snapshot_id)
+
+    def _redis_client(self):
+        client = getattr(self.cache, "client", None)
+        if client is None or not hasattr(client, "get_client"):
+            return None
+        return client.get_client(write=True)
+
+    def _write_snapshot(self, key, snapshot_id, uuid_list):
+        snapshot_key = self._snapshot_key(key, snapshot_id)
+        redis = self._redis_client()
+        if redis is None:
+            self.cache_set(snapshot_key, uuid_list, self.snapshot_expire_duration)
+            return
+
+        redis_key = self.cache.make_key(self._format_key(snapshot_key))
+        pipeline = redis.pipeline()
+        pipeline.delete(redis_key)
+        if uuid_list:
+            pipeline.rpush(redis_key, *uuid_list)
+            pipeline.expire(redis_key, self.snapshot_expire_duration)
+        pipeline.execute()
+
+    def _read_snapshot(self, key, snapshot_id, start, end):
+        """
+        Returns the `[start:end]` slice of a snapshot, `None` if it expired.
+        """
+        snapshot_key = self._snapshot_key(key, snapshot_id)
+        redis = self._redis_client()
+        if redis is None:
+            uuid_list = self.cache_get(snapshot_key)
+            return None if uuid_list is None else uuid_list[start:end]
+
+        redis_key = self.cache.make_key(self._format_key(snapshot_key))
+        pipeline = redis.pipeline()
+        pipeline.exists(redis_key)
+        pipeline.lrange(redis_key, start, end - 1)
+        exists, uuid_list = pipeline.execute()
+        if not exists:
+            # empty snapshots are never written, fall back to the current one
+            return None
+        return [item_key.decode("utf-8") for item_key in uuid_list]
+
+
+class PaginationCountCache(CacheBase):
+    """
+    Counts of paginated querysets. Keys carry a version per model, bumped
+    whenever a row of the model is saved or deleted, so the TTL only bounds
+    staleness from bulk `update`/`delete` which send no signals.
+    """
+
+    expire_duration = 30
+    version_expire_duration = 60 * 60 * 24
+    key_prefix = "pagination_count"
+
+    def get(self, key):
+        return self.cache_get(key)
+
+    def set(self, key, count):
+        self.cache_set(key, count)
+
+    def get_version(self, model):
+        model = model._meta.concrete_model
+        return self.cache_get((model._meta.label, "version")) or 0
+
+    def bump_version(self, model):
+        model = model._meta.concrete_model
+        key = self._format_key((model._meta.label, "version"))
+        if not self.cache.add(key, 1, self.version_expire_duration):
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                # expired between add and incr
+                self.cache.set(key, 1, self.version_expire_duration)
+
+
+def bump_pagination_count_version(sender, **kwargs):
+    PaginationCountCache().bump_version(sender)
@@ -0,0 +1,97 @@
+import math
+import threading
+import time
+from uuid import uuid4
+
+from .cache_base import CacheBase
+
+# Sliding log in a sorted set scored by the hit time in milliseconds. Expired
+# hits are trimmed, the new hit is only recorded while under the limit.
+# Returns {allowed, hits in the window, milliseconds until the next free slot}.
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+
+redis.call("ZREMRANGEBYSCORE", key, "-inf", now - window)
+local count = redis.call("ZCARD", key)
+if count >= limit then
+    local oldest = redis.call("ZRANGE", key, 0, 0, "WITHSCORES")
+    local retry_after = 0
+    if oldest[2] then
+        retry_after = tonumber(oldest[2]) + window - now
+    end
+    return {0, count, retry_after}
+end
+redis.call("ZADD", key, now, ARGV[4])
+redis.call("PEXPIRE", key, window)
+return {1, count + 1, 0}
+"""
+
+
+class RateLimitCache(CacheBase):
+    """
+    Sliding window rate limiter, `hit` checks the limit and records the hit
+    in one step.
+
+    On Redis this is a single Lua script call, so concurrent requests can
+    never both take the last slot. Other backends keep the hit times in a
+    list guarded by a process lock, which is enough for the local and test
+    caches.
+    """
+
+    _local_lock = threading.Lock()
+    # registered once, the sha is the same for every client
+    _script = None
+
+    def hit(self, key, limit, window):
+        """
+        Records a hit unless `limit` hits were already recorded in the last
+        `window` seconds.
+
+        Returns (allowed, hits in the window, seconds until a slot frees up).
+        """
+        now = int(time.time() * 1000)
+        window = int(window * 1000)
+        redis = self._redis_client()
+        if redis is None:
+            allowed, count, retry_after = self._local_hit(key, limit, window, now)
+        else:
+            allowed, count, retry_after = self._get_script(redis)(
+                keys=[self.cache.make_key(self._format_key(key))],
+                args=[now, window, limit, f"{now}-{uuid4().hex[:8]}"],
+                client=redis,
+            )
+        return bool(allowed), int(count), int(retry_after) / 1000
+
+    def count(self, key, window):
+        now = int(time.time() * 1000)
+        window = int(window * 1000)
+        redis = self._redis_client()
+        if redis is None:
+            hits = self.cache_get(key) or []
+            return len([hit for hit in hits if hit > now - window])
+        redis_key = self.cache.make_key(self._format_key(key))
+        return redis.zcount(redis_key, f"({now - window}", "+inf")
+
+    def _local_hit(self, key, limit, window, now):
+        with self._local_lock:
+            hits = [hit for hit in self.cache_get(key) or [] if hit > now - window]
+            if len(hits) >= limit:
+                return False, len(hits), hits[0] + window - now
+            hits.append(now)
+            self.cache_set(key, hits, math.ceil(window / 1000))
+            return True, len(hits), 0
+
+    @classmethod
+    def _get_script(cls, redis):
+        if RateLimitCache._script is None:
+            RateLimitCache._script = redis.register_script(SLIDING_WINDOW_SCRIPT)
+        return RateLimitCache._script
+
+    def _redis_client(self):
+        client = getattr(self.cache, "client", None)
+        if client is None or not hasattr(client, "get_client"):
+            return None
+        return client.get_client(write=True)
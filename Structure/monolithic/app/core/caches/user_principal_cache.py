@@ -0,0 +1,112 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils.functional import SimpleLazyObject, empty
+
+from .cache_base import CacheBase
+
+
+class UserPrincipal(SimpleLazyObject):
+    """
+    The user of an authenticated request, built from the cached snapshot.
+
+    Snapshot fields are answered without a query, any other attribute loads
+    the full user from the database on first access.
+    """
+
+    def __init__(self, snapshot):
+        user_id = snapshot["id"]
+        super().__init__(lambda: get_user_model().objects.get(id=user_id))
+        self.__dict__["_snapshot"] = snapshot
+
+    def __getattr__(self, name):
+        if self._wrapped is empty:
+            snapshot = self.__dict__["_snapshot"]
+            if name in snapshot:
+                return snapshot[name]
+            self._setup()
+        return getattr(self._wrapped, name)
+
+    # truth, equality and hashing of users only need the primary key
+
+    def __bool__(self):
+        return True
+
+    def __hash__(self):
+        return hash(self.__dict__["_snapshot"]["pk"])
+
+    def __eq__(self, other):
+        if type(other) is UserPrincipal:
+            return self.__dict__["_snapshot"]["pk"] == other.__dict__["_snapshot"]["pk"]
+        meta = getattr(other, "_meta", None)
+        if meta is None or meta.concrete_model is not get_user_model():
+            return NotImplemented
+        return self.__dict__["_snapshot"]["pk"] == other.pk
+
+    def __ne__(self, other):
+        # the proxied `!=` of `SimpleLazyObject` would load the user
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+
+class UserPrincipalCache(CacheBase):
+    """
+    Compact user snapshots for `MMDJWTAuthentication`, kept in a per process
+    dict (L1) in front of the shared cache (L2).
+
+    Saving a user deletes its L2 entry and the L1 entry of the saving
+    process once the transaction commits, other processes see the change
+    after at most `l1_expire_duration`.
+    """
+
+    key_prefix = "principal"
+    expire_duration = 60 * 5
+    l1_expire_duration = 5
+    l1_max_size = 10000
+
+    snapshot_fields = ("id", "uuid", "type", "banned", "is_active")
+    role_fields = ("is_staff", "is_superuser")
+
+    _l1 = {}
+    _l1_lock = threading.Lock()
+
+    def get(self, user_id):
+        now = time.monotonic()
+        cached = self._l1.get(user_id)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+
+        snapshot = self.cache_get(user_id)
+        if snapshot is None:
+            user = get_user_model().objects.filter(id=user_id).first()
+            if user is None:
+                return None
+            snapshot = self.to_snapshot(user)
+            self.cache_set(user_id, snapshot)
+
+        with self._l1_lock:
+            if len(self._l1) >= self.l1_max_size:
+                self._l1.clear()
+            self._l1[user_id] = (snapshot, now + self.l1_expire_duration)
+        return snapshot
+
+    def to_snapshot(self, user):
+        snapshot = {field: getattr(user, field) for field in self.snapshot_fields}
+        snapshot.update({field: getattr(user, field) for field in self.role_fields})
+        snapshot["pk"] = user.pk
+        snapshot["is_authenticated"] = True
+        snapshot["is_anonymous"] = False
+        return snapshot
+
+    def delete(self, user_id):
+        with self._l1_lock:
+            self._l1.pop(user_id, None)
+        super().delete(user_id)
+
+
+def delete_user_principal_cache(sender, instance, **kwargs):
+    # a request reading the user before the commit would cache the old row
+    user_id = instance.id
+    transaction.on_commit(lambda: UserPrincipalCache().delete(user_id))
@@ -1,15 +1,179 @@
+import atexit
 import json
 import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import deque
 
 import boto3
 from botocore.exceptions import ClientError
 from django.conf import settings
+from django.db import transaction
 
 logger = logging.getLogger("django.eventlogger")
 events = boto3.client("events")
 
 
+class LocalEventsClient:
+    """
+    Offline stand-in for the boto3 `events` client used in test and local.
+
+    The last `max_entries` entries are kept in `entries`, set `fail_next` to
+    make the next N entries fail the way `PutEvents` reports partial failures.
+    """
+
+    def __init__(self, max_entries=1000):
+        self.entries = deque(maxlen=max_entries)
+        self.fail_next = 0
+
+    def put_events(self, Entries):
+        results = []
+        for entry in Entries:
+            if self.fail_next:
+                self.fail_next -= 1
+                results.append(
+                    {"ErrorCode": "InternalFailure", "ErrorMessage": "stub failure"}
+                )
+                continue
+            logger.info(
+                f"eventbridge mock: {entry['DetailType']} - {entry['Detail']} "
+            )
+            self.entries.append(entry)
+            results.append({"EventId": uuid.uuid4().hex})
+        failed = sum(1 for result in results if "ErrorCode" in result)
+        return {"FailedEntryCount": failed, "Entries": results}
+
+
+class EventsPublisher:
+    """
+    Sends queued entries from a background thread, up to `batch_size` per
+    `PutEvents` call. Entries reported as failed are retried with a backoff
+    up to `max_attempts` times. At most `max_pending` entries are queued,
+    newer ones are dropped and logged.
+    """
+
+    # PutEvents accepts at most 10 entries
+    batch_size = 10
+
+    def __init__(
+        self, client, max_attempts=3, backoff=0.5, linger=0.05, max_pending=10000
+    ):
+        self.client = client
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        # how long to wait for more entries before sending a partial batch
+        self.linger = linger
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.worker_pid = None
+        self.worker_lock = threading.Lock()
+
+    def publish(self, entries):
+        for entry in entries:
+            self.enqueue(entry, 1)
+        self.start_worker()
+
+    def enqueue(self, entry, attempt):
+        try:
+            self.queue.put_nowait((entry, attempt))
+        except queue.Full:
+            logger.error(
+                f"event dropped, publisher queue full "
+                f"event_name: {entry['DetailType']} params: {entry['Detail']}"
+            )
+
+    def start_worker(self):
+        # threads do not survive a fork, start one per process
+        if self.worker_pid == os.getpid():
+            return
+        with self.worker_lock:
+            if self.worker_pid == os.getpid():
+                return
+            self.worker_pid = os.getpid()
+        threading.Thread(target=self.run_worker, daemon=True).start()
+
+    def run_worker(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.linger
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self.send(batch)
+
+    def flush(self):
+        """Sends everything queued on the calling thread, retries included."""
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            self.send(batch, wait=False)
+
+    def send(self, batch, wait=True):
+        """
+        Args:
+            batch: list of (entry, attempt) tuples.
+            wait: sleep the backoff before requeuing failed entries.
+        """
+        entries = [entry for entry, _ in batch]
+        try:
+            response = self.client.put_events(Entries=entries)
+            results = response["Entries"]
+        except ClientError as e:
+            logger.error(f"error sending events error {e}")
+            results = [{"ErrorCode": "ClientError"}] * len(batch)
+
+        retries = []
+        for (entry, attempt), result in zip(batch, results):
+            if "ErrorCode" not in result:
+                continue
+            if attempt >= self.max_attempts:
+                logger.error(
+                    f"event dropped after {attempt} attempts "
+                    f"error: {result.get('ErrorCode')} {result.get('ErrorMessage')} "
+                    f"event_name: {entry['DetailType']} "
+                    f"bus_name: {entry['EventBusName']} "
+                    f"params: {entry['Detail']}"
+                )
+                continue
+            retries.append((entry, attempt + 1))
+
+        sent = len(batch) - len(retries)
+        logger.info(f"Events emitted {sent}/{len(batch)}")
+        if retries:
+            if wait:
+                time.sleep(self.backoff * retries[0][1])
+            for entry, attempt in retries:
+                self.enqueue(entry, attempt)
+
+
+publisher = EventsPublisher(
+    client=LocalEventsClient() if settings.ENV in ["test", "local"] else events,
+    max_attempts=settings.EVENTS_MAX_ATTEMPTS,
+    max_pending=settings.EVENTS_MAX_PENDING,
+)
+atexit.register(publisher.flush)
+
+
 class BaseEventsEmitter:
+    """
+    Events are sent after the current transaction commits and dropped when it
+    or the savepoint they were emitted in rolls back. `publisher` batches
+    them into `PutEvents` calls off the request thread.
+    """
+
     SOURCE = None
     EVENT_BUS = None
     TARGET = ["eventbridge"]
@@ -21,27 +185,15 @@ class BaseEventsEmitter:
         pass
 
     def emit_eventbridge(self, event_name, params):
-        if settings.ENV in ["test", "local"]:
-            logger.info(f"eventbridge mock: {event_name} - {params} ")
-            return
-        try:
-            put_events = events.put_events(
-                Entries=[
-                    {
-                        "Source": self.SOURCE,
-                        "DetailType": event_name,
-                        "Detail": json.dumps({"params": params}),
-                        "EventBusName": settings.EVENT_BUS_PUSHOPS,
-                        "Resources": [],
-                    },
-                ]
-            )
-            logger.info(f"Event emitted {put_events}")
-        except ClientError as e:
-            logger.error(f"error sending event error {e}")
-            logger.error(f"event_name: {event_name}")
-            logger.error(f"bus_name: {self.EVENT_BUS}")
-            logger.error(f"params: {params}")
+        entry = {
+            "Source": self.SOURCE,
+            "DetailType": event_name,
+            "Detail": json.dumps({"params": params}),
+            "EventBusName": self.EVENT_BUS,
+            "Resources": [],
+        }
+        # runs immediately outside of a transaction
+        transaction.on_commit(lambda: publisher.publish([entry]))
 
 
 """
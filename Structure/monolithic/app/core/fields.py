@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from django.db.models.fields.files import ImageField
+from django.db.models.signals import post_save
 from easy_thumbnails import files
 from easy_thumbnails.fields import ThumbnailerField
 from phonenumber_field.modelfields import PhoneNumberField
@@ -19,6 +20,9 @@ class ThumbnailerImageField(ThumbnailerField, ImageField):
     An image field which provides easier access for retrieving (and generating)
     thumbnails.
 
+    Thumbnails of all the configured aliases are generated in the background
+    by `core.thumbnails.thumbnail_generator` after a new image is saved.
+
     To use a different file storage for thumbnails, provide the
     ``thumbnail_storage`` keyword argument.
 
@@ -39,3 +43,28 @@ class ThumbnailerImageField(ThumbnailerField, ImageField):
         self.db_collation = db_collation
 
         super().__init__(*args, **kwargs)
+
+    def contribute_to_class(self, cls, name, **kwargs):
+        super().contribute_to_class(cls, name, **kwargs)
+        if not cls._meta.abstract:
+            post_save.connect(
+                self.queue_thumbnails,
+                sender=cls,
+                weak=False,
+                dispatch_uid=f"thumbnails_{cls._meta.label}_{name}",
+            )
+
+    def pre_save(self, model_instance, add):
+        file = getattr(model_instance, self.attname)
+        changed = bool(file) and not file._committed
+        file = super().pre_save(model_instance, add)
+        if changed:
+            file.generate_thumbnails = True
+        return file
+
+    def queue_thumbnails(self, sender, instance, **kwargs):
+        from .thumbnails import thumbnail_generator
+
+        file = getattr(instance, self.attname)
+        if file and file.__dict__.pop("generate_thumbnails", False):
+            thumbnail_generator.queue(instance, self.name)
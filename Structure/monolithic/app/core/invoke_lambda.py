@@ -1,17 +1,86 @@
 import json
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
+from botocore.config import Config
 from django.conf import settings
 
 logger = logging.getLogger("django.eventlogger")
 
 session = boto3.session.Session()
-LAMBDA_CLIENT = session.client("lambda", region_name=settings.AWS_DEFAULT_REGION)
+# boto3 clients are thread safe, the pool workers share this one and its
+# connection pool
+LAMBDA_CLIENT = session.client(
+    "lambda",
+    region_name=settings.AWS_DEFAULT_REGION,
+    config=Config(max_pool_connections=settings.LAMBDA_MAX_WORKERS),
+)
 
 
-# TODO asyncio call uvloop
-def invoke_lambda(function_name, payload):
+class LambdaInvoker:
+    """
+    Fire and forget Lambda invocations on a bounded thread pool.
+
+    At most `max_pending` invocations are queued or running, further ones
+    are rejected instead of piling up in memory. Failures are logged and
+    passed to the `on_failure(exception)` callback of the invocation.
+    """
+
+    def __init__(self, max_workers, max_pending):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.lock = threading.Lock()
+        self.executor = None
+        self.executor_pid = None
+        self.slots = None
+
+    def get_executor(self):
+        # the pool threads do not survive a fork, create one pool per process
+        with self.lock:
+            if self.executor_pid != os.getpid():
+                self.executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="invoke_lambda"
+                )
+                self.slots = threading.BoundedSemaphore(self.max_pending)
+                self.executor_pid = os.getpid()
+            return self.executor
+
+    def submit(self, function_name, payload, on_failure=None):
+        executor = self.get_executor()
+        if not self.slots.acquire(blocking=False):
+            error = RuntimeError(f"{self.max_pending} invocations already pending")
+            logger.error(f"Lambda {function_name} invoke rejected: {error}")
+            if on_failure:
+                on_failure(error)
+            return None
+        future = executor.submit(
+            invoke_lambda, function_name, payload, raise_error=True
+        )
+        future.add_done_callback(
+            lambda future: self.done(function_name, future, on_failure)
+        )
+        return future
+
+    def done(self, function_name, future, on_failure):
+        self.slots.release()
+        error = future.exception()
+        if error is not None and on_failure:
+            try:
+                on_failure(error)
+            except Exception as e:
+                logger.error(f"Lambda {function_name} on_failure error: {e}")
+
+
+invoker = LambdaInvoker(
+    max_workers=settings.LAMBDA_MAX_WORKERS,
+    max_pending=settings.LAMBDA_MAX_PENDING,
+)
+
+
+def invoke_lambda(function_name, payload, raise_error=False):
     try:
         ret = LAMBDA_CLIENT.invoke(
             FunctionName=function_name,
@@ -27,4 +96,16 @@ def invoke_lambda(function_name, payload):
         logger.error(
             f"Lambda {function_name} invoke error with {payload} \n " f"error: {e}"
         )
+        if raise_error:
+            raise
         return None
+
+
+def invoke_lambda_async(function_name, payload, on_failure=None):
+    """
+    Invokes the Lambda without waiting for the round trip.
+
+    Returns the `Future` of the invocation, `None` when it was rejected
+    because `LAMBDA_MAX_PENDING` invocations are pending.
+    """
+    return invoker.submit(function_name, payload, on_failure=on_failure)
@@ -1,11 +1,20 @@
 # -*- coding: utf-8 -*-
+import atexit
 import copy
+import logging
+import os
+import threading
+import time
+import traceback
 from logging import CRITICAL, DEBUG, ERROR, FATAL, INFO, NOTSET, WARNING, Formatter
 
 from django.conf import settings
+from django.http import HttpRequest
 from django.views.debug import ExceptionReporter
 from django_slack.log import SlackExceptionHandler
 
+from .utils import tokey
+
 ERROR_COLOR = "danger"  # color name is built in to Slack API
 WARNING_COLOR = "warning"  # color name is built in to Slack API
 INFO_COLOR = "#439FE0"
@@ -34,8 +43,72 @@ class NoStacktraceFormatter(Formatter):
         return None
 
 
+class SlackReport:
+    __slots__ = ("record", "subject", "request", "count")
+
+    def __init__(self, record, subject, request):
+        self.record = record
+        self.subject = subject
+        self.request = request
+        self.count = 1
+
+
 class DmmSlackExceptionHandler(SlackExceptionHandler):
+    """
+    Reports errors to Slack from a background thread.
+
+    `emit` only fingerprints the record. Records with the same fingerprint
+    within `SLACK_REPORT_FLUSH_INTERVAL` seconds are sent as one message with
+    an occurrence count. A fingerprint gets at most one full report per
+    `SLACK_REPORT_RATE_LIMIT` seconds, later occurrences are summed up in a
+    digest message.
+    """
+
+    flush_interval = settings.SLACK_REPORT_FLUSH_INTERVAL
+    rate_limit = settings.SLACK_REPORT_RATE_LIMIT
+    max_pending = settings.SLACK_REPORT_MAX_PENDING
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.reports_lock = threading.Lock()
+        # {fingerprint: SlackReport} waiting for the next flush
+        self.pending = {}
+        # {fingerprint: [subject, count]} rate limited since the last flush
+        self.suppressed = {}
+        # {fingerprint: time of the last full report}
+        self.reported_at = {}
+        self.worker_pid = None
+        atexit.register(self.flush)
+
     def emit(self, record):
+        try:
+            subject, request = self.get_subject(record)
+            fingerprint = self.get_fingerprint(record)
+            now = time.monotonic()
+            with self.reports_lock:
+                report = self.pending.get(fingerprint)
+                if report is not None:
+                    report.count += 1
+                    return
+                reported_at = self.reported_at.get(fingerprint)
+                rate_limited = (
+                    reported_at is not None and now - reported_at < self.rate_limit
+                )
+                if rate_limited or len(self.pending) >= self.max_pending:
+                    suppressed = self.suppressed.setdefault(fingerprint, [subject, 0])
+                    suppressed[1] += 1
+                    return
+                # the request is closed by the time the worker renders it
+                request = self.snapshot_request(request)
+                record = copy.copy(record)
+                record.request = request
+                self.pending[fingerprint] = SlackReport(record, subject, request)
+                self.reported_at[fingerprint] = now
+            self.start_worker()
+        except Exception:
+            self.handleError(record)
+
+    def get_subject(self, record):
         try:
             request = record.request
 
@@ -58,7 +131,91 @@ class DmmSlackExceptionHandler(SlackExceptionHandler):
                 record.getMessage(),
             )
             request = None
-        subject = self.format_subject(subject)
+        return self.format_subject(subject), request
+
+    @staticmethod
+    def snapshot_request(request):
+        """
+        Copies what `ExceptionReporter` renders of the request, the worker
+        must not touch the stream, session or user of a finished request.
+        """
+        if request is None:
+            return None
+        snapshot = HttpRequest()
+        snapshot.method = request.method
+        snapshot.path = request.path
+        snapshot.path_info = request.path_info
+        snapshot.META = {
+            key: value
+            for key, value in request.META.items()
+            if isinstance(value, (str, int, float, bool))
+        }
+        snapshot.GET = request.GET.copy()
+        snapshot.COOKIES = dict(request.COOKIES)
+        try:
+            snapshot.POST = request.POST.copy()
+        except Exception:
+            # the body may have been read as a stream already
+            pass
+        try:
+            snapshot.user = str(request.user)
+        except Exception:
+            # reported without the user
+            pass
+        return snapshot
+
+    def get_fingerprint(self, record):
+        """Exception type and the line raising it, the message template otherwise."""
+        if record.exc_info and record.exc_info[2] is not None:
+            exc_type, _, tb = record.exc_info
+            frame = traceback.extract_tb(tb)[-1]
+            return tokey(exc_type.__name__, frame.filename, frame.lineno)
+        return tokey(record.name, record.levelname, record.msg)
+
+    def start_worker(self):
+        # threads do not survive a fork, start one per process
+        if self.worker_pid == os.getpid():
+            return
+        with self.reports_lock:
+            if self.worker_pid == os.getpid():
+                return
+            self.worker_pid = os.getpid()
+        threading.Thread(target=self.run_worker, daemon=True).start()
+
+    def run_worker(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def flush(self):
+        with self.reports_lock:
+            pending, self.pending = self.pending, {}
+            suppressed, self.suppressed = self.suppressed, {}
+            expired_before = time.monotonic() - self.rate_limit
+            self.reported_at = {
+                fingerprint: reported_at
+                for fingerprint, reported_at in self.reported_at.items()
+                if reported_at > expired_before
+            }
+
+        for report in pending.values():
+            try:
+                self.send_report(report)
+            except Exception:
+                self.handleError(report.record)
+        if suppressed:
+            try:
+                self.send_digest(suppressed)
+            except Exception:
+                # no record of its own, reported the way `handleError` does
+                self.handleError(
+                    logging.makeLogRecord(
+                        {"msg": "slack digest of %d errors", "args": (len(suppressed),)}
+                    )
+                )
+
+    def send_report(self, report):
+        record = report.record
 
         # Since we add a nicely formatted traceback on our own, create a copy
         # of the log record without the exception data.
@@ -71,7 +228,7 @@ class DmmSlackExceptionHandler(SlackExceptionHandler):
         else:
             exc_info = (None, record.getMessage(), None)
 
-        reporter = ExceptionReporter(request, is_email=True, *exc_info)
+        reporter = ExceptionReporter(report.request, is_email=True, *exc_info)
 
         try:
             tb = reporter.get_traceback_text()
@@ -84,6 +241,11 @@ class DmmSlackExceptionHandler(SlackExceptionHandler):
                 )
 
         message = "{}\n\n{}".format(self.format(no_exc_record), tb)
+        subject = report.subject
+        if report.count > 1:
+            subject = "{} (x{} in {}s)".format(
+                subject, report.count, self.flush_interval
+            )
 
         colors = {
             "ERROR": "danger",
@@ -103,3 +265,21 @@ class DmmSlackExceptionHandler(SlackExceptionHandler):
             {"text": subject, "channel": settings.SLACK_ERROR_CHANNEL},
             self.generate_attachments(**attachments),
         )
+
+    def send_digest(self, suppressed):
+        subject = "[{}] {} rate limited errors".format(
+            settings.ENV_ALIAS, sum(count for _, count in suppressed.values())
+        )
+        message = "\n".join(
+            "x{} {}".format(count, error_subject)
+            for error_subject, count in sorted(
+                suppressed.values(), key=lambda item: item[1], reverse=True
+            )
+        )
+        attachments = {"title": subject, "text": message, "color": WARNING_COLOR}
+        attachments.update(self.kwargs)
+        self.send_message(
+            self.template,
+            {"text": subject, "channel": settings.SLACK_ERROR_CHANNEL},
+            self.generate_attachments(**attachments),
+        )
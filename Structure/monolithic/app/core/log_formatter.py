@@ -64,6 +64,10 @@ class MMDECSRequestFormatter(ECSRequestFormatter):
                     zipkin_header
                 ]  # noqa E501
 
+        # request profile of sampled requests, see core.profiler
+        for key, value in getattr(self.record, "profile", {}).items():
+            extra_labels[f"perf_{key}"] = value
+
         logger_event = self._get_event_base(
             extra_labels=extra_labels,
         )
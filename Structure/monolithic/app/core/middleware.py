@@ -24,6 +24,14 @@ class UserBasedExceptionMiddleware(object):
 
 
 class MMDLoggingMiddleware(LoggingMiddleware):
+    def _get_logging_context(self, request, response):
+        logging_context = super()._get_logging_context(request, response)
+        # set by core.profiler.RequestProfilerMiddleware on sampled requests
+        profile = getattr(request, "profile", None)
+        if profile:
+            logging_context["kwargs"]["extra"]["profile"] = profile
+        return logging_context
+
     def _log_request_headers(self, request, logging_context, log_level):
         if IS_DJANGO_VERSION_GTE_3_2_0:
             headers = {
@@ -1,18 +1,231 @@
 # -*- coding: utf-8 -*-
+import json
 from collections import OrderedDict
+from functools import partial
 
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+from django.utils.functional import cached_property
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
+from .caches import PaginationCountCache, bump_pagination_count_version
+from .utils import tokey
 
-class LargeResultsSetPagination(PageNumberPagination):
-    page_size = 1000
-    page_size_query_param = "page_size"
-    max_page_size = 1000
+
+class ExactCountStrategy:
+    def count(self, queryset):
+        return queryset.count()
+
+
+class NoCountStrategy:
+    def count(self, queryset):
+        return None
+
+
+class CachedCountStrategy(ExactCountStrategy):
+    """
+    Caches the count per (queryset fingerprint, user scope) for a short TTL,
+    the cache is dropped on writes to the queryset's model. Only counted
+    models are watched for writes, from the first count in each process on;
+    processes that never counted a model rely on the TTL.
+
+    On Postgres, querysets the planner estimates above `estimate_threshold`
+    rows are not counted at all; the estimate is returned instead. Counts are
+    only displayed, pages are validated without them.
+    """
+
+    # concrete models whose writes bump their count version
+    watched_models = set()
+
+    def __init__(self, scope="anon", estimate_threshold=None):
+        self.scope = scope
+        self.estimate_threshold = estimate_threshold
+        self.cache = PaginationCountCache()
+
+    @classmethod
+    def watch(cls, model):
+        concrete_model = model._meta.concrete_model
+        if concrete_model in cls.watched_models:
+            return
+        # saves through a proxy model are sent with the proxy as sender
+        for sender in apps.get_models():
+            if sender._meta.concrete_model is not concrete_model:
+                continue
+            label = sender._meta.label
+            post_save.connect(
+                bump_pagination_count_version,
+                sender=sender,
+                dispatch_uid=f"bump_pagination_count_version_save_{label}",
+            )
+            post_delete.connect(
+                bump_pagination_count_version,
+                sender=sender,
+                dispatch_uid=f"bump_pagination_count_version_delete_{label}",
+            )
+        cls.watched_models.add(concrete_model)
+
+    def count(self, queryset):
+        try:
+            fingerprint = self.fingerprint(queryset)
+        except EmptyResultSet:
+            return 0
+
+        self.watch(queryset.model)
+        version = self.cache.get_version(queryset.model)
+        key = (fingerprint, self.scope, version)
+        count = self.cache.get(key)
+        if count is None:
+            count = self.estimate(queryset)
+            if count is None:
+                count = super().count(queryset)
+            self.cache.set(key, count)
+        return count
+
+    @staticmethod
+    def fingerprint(queryset):
+        sql, params = queryset.query.sql_with_params()
+        return tokey(queryset.db, sql, *params)
+
+    def estimate(self, queryset):
+        if self.estimate_threshold is None:
+            return None
+        estimate = estimate_count(queryset)
+        if estimate is None or estimate < self.estimate_threshold:
+            return None
+        return estimate
+
+
+def estimate_count(queryset):
+    """
+    Returns the Postgres row estimate of a queryset, `None` on other vendors.
+
+    Unfiltered querysets read `pg_class.reltuples`, filtered ones use the
+    planner estimate from `EXPLAIN`.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    with connection.cursor() as cursor:
+        if not queryset.query.where and not queryset.query.distinct:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+        else:
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        row = cursor.fetchone()
+
+    if row is None:
+        return None
+    if isinstance(row[0], (int, float)):
+        estimate = int(row[0])
+    else:
+        plan = row[0] if isinstance(row[0], list) else json.loads(row[0])
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+    # reltuples is -1 for tables that have never been analyzed
+    return estimate if estimate >= 0 else None
+
+
+class CountStrategyPaginator(Paginator):
+    """
+    Paginator that delegates `count` to a counting strategy.
+
+    The count may be cached or estimated, so it is only displayed. Pages are
+    read with one extra row to find out whether a next page exists, and a
+    page is only missing when it has no rows.
+    """
+
+    def __init__(self, object_list, per_page, count_strategy=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_strategy = count_strategy or ExactCountStrategy()
+        self._page_number = 1
+        self._has_next = False
+
+    @cached_property
+    def count(self):
+        return self.count_strategy.count(self.object_list)
+
+    @property
+    def num_pages(self):
+        # only used for the "last" page and the browsable API controls
+        if self.count is None:
+            return self._known_num_pages
+        return max(super().num_pages, self._known_num_pages)
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        object_list = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not object_list and number > 1:
+            raise EmptyPage("That page contains no results")
+        self._page_number = number
+        self._has_next = len(object_list) > self.per_page
+        return CountlessPage(object_list[: self.per_page], number, self)
+
+    @property
+    def _known_num_pages(self):
+        # lower bound from the pages read so far
+        return self._page_number + int(self._has_next)
+
+
+class CountlessPage(Page):
+    def has_next(self):
+        return self.paginator._has_next
 
 
 class MMDPageNumberPagination(PageNumberPagination):
+    """
+    Page number pagination with a pluggable counting strategy.
+
+    Counts are cached per queryset and user for a short TTL and replaced by
+    the Postgres estimate above `PAGINATION_ESTIMATE_COUNT_THRESHOLD` rows.
+    Clients can pass `count=false` to skip counting, `count` is then `None`.
+    The last page is always located with an exact count.
+    """
+
     page_size_query_param = "page_size"
+    count_query_param = "count"
+    estimate_count_threshold = settings.PAGINATION_ESTIMATE_COUNT_THRESHOLD
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.django_paginator_class = partial(
+            CountStrategyPaginator, count_strategy=self.get_count_strategy(request)
+        )
+        return super().paginate_queryset(queryset, request, view=view)
+
+    def get_count_strategy(self, request):
+        page_param = request.query_params.get(self.page_query_param, "")
+        if page_param in self.last_page_strings:
+            return ExactCountStrategy()
+
+        count_param = request.query_params.get(self.count_query_param, "")
+        if count_param.lower() in ["0", "false"]:
+            return NoCountStrategy()
+
+        user = getattr(request, "user", None)
+        if user and user.is_authenticated:
+            scope = str(user.uuid)
+        else:
+            scope = "anon"
+        return CachedCountStrategy(
+            scope=scope, estimate_threshold=self.estimate_count_threshold
+        )
 
     def get_paginated_response(self, data):
         return Response(
@@ -27,3 +240,9 @@ class MMDPageNumberPagination(PageNumberPagination):
                 ]
             )
         )
+
+
+class LargeResultsSetPagination(PageNumberPagination):
+    page_size = 1000
+    page_size_query_param = "page_size"
+    max_page_size = 1000
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+import contextvars
+import random
+import re
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.serializers import BaseSerializer
+
+# profile of the current request, `None` when the request is not sampled
+_current_profile = contextvars.ContextVar("request_profile", default=None)
+
+_SERVER_TIMING_TOKEN = re.compile(r"[^A-Za-z0-9_-]")
+
+
+class RequestProfile:
+    __slots__ = (
+        "started_at",
+        "wall_time",
+        "db_queries",
+        "db_time",
+        "cache",
+        "serializer_time",
+        "serializer_depth",
+    )
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.wall_time = 0.0
+        self.db_queries = 0
+        self.db_time = 0.0
+        # {key_prefix: [hits, misses]}
+        self.cache = {}
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+    def finish(self):
+        self.wall_time = time.perf_counter() - self.started_at
+
+    def as_log_fields(self):
+        fields = {
+            "wall_ms": round(self.wall_time * 1000, 2),
+            "db_queries": self.db_queries,
+            "db_ms": round(self.db_time * 1000, 2),
+            "serializer_ms": round(self.serializer_time * 1000, 2),
+        }
+        for prefix, (hits, misses) in self.cache.items():
+            fields[f"cache_{prefix}_hits"] = hits
+            fields[f"cache_{prefix}_misses"] = misses
+        return fields
+
+    def as_server_timing(self):
+        metrics = [
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.db_queries} queries"',
+            f"serializer;dur={self.serializer_time * 1000:.2f}",
+        ]
+        for prefix, (hits, misses) in self.cache.items():
+            name = _SERVER_TIMING_TOKEN.sub("_", prefix)
+            metrics.append(f'cache-{name};desc="hits={hits} misses={misses}"')
+        metrics.append(f"total;dur={self.wall_time * 1000:.2f}")
+        return ", ".join(metrics)
+
+
+def record_cache_access(key_prefix, hits=0, misses=0):
+    """Called by `CacheBase` reads, no-op outside of a sampled request."""
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    counters = profile.cache.get(key_prefix)
+    if counters is None:
+        counters = profile.cache[key_prefix] = [0, 0]
+    counters[0] += hits
+    counters[1] += misses
+
+
+def _profile_queries(execute, sql, params, many, context):
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started_at = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.db_queries += 1
+        profile.db_time += time.perf_counter() - started_at
+
+
+def _install_serializer_timer():
+    """
+    Times `BaseSerializer.data`, which `Serializer.data` and
+    `ListSerializer.data` both go through. Nested `.data` calls are only
+    counted once.
+    """
+    data_property = BaseSerializer.data
+    if getattr(data_property.fget, "is_profiled", False):
+        return
+
+    def data(serializer):
+        profile = _current_profile.get()
+        if profile is None:
+            return data_property.fget(serializer)
+        profile.serializer_depth += 1
+        started_at = time.perf_counter()
+        try:
+            return data_property.fget(serializer)
+        finally:
+            profile.serializer_depth -= 1
+            if profile.serializer_depth == 0:
+                profile.serializer_time += time.perf_counter() - started_at
+
+    data.is_profiled = True
+    BaseSerializer.data = property(data)
+
+
+class RequestProfilerMiddleware:
+    """
+    Profiles `PROFILER_SAMPLE_RATE` of the requests: wall time, DB queries and
+    time, cache hits and misses per `CacheBase` prefix and serializer time.
+
+    The profile is returned in the `Server-Timing` header and stored on
+    `request.profile`, `MMDLoggingMiddleware` adds it to the request log. It
+    must be placed after `MMDLoggingMiddleware`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.PROFILER_SAMPLE_RATE
+        _install_serializer_timer()
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(_profile_queries))
+                response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+            profile.finish()
+
+        request.profile = profile.as_log_fields()
+        response["Server-Timing"] = profile.as_server_timing()
+        return response
@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 from django.contrib.auth import get_user_model
-from easy_thumbnails.templatetags.thumbnail import thumbnail_url
 from rest_framework import serializers
 
+from .thumbnails import existing_thumbnail_url
+
 USER = get_user_model()
 
 
@@ -11,8 +12,10 @@ class BlankSerializer(serializers.Serializer):
 
 
 class ThumbnailSerializer(serializers.ImageField):
+    """Falls back to the original image until the thumbnail is generated."""
+
     def to_representation(self, instance):
-        return thumbnail_url(instance, "medium")
+        return existing_thumbnail_url(instance, "medium")
 
 
 class BaseErrorSerializer(serializers.Serializer):
@@ -3,7 +3,7 @@ import logging
 
 import boto3
 from botocore.exceptions import ClientError
-from core.invoke_lambda import invoke_lambda
+from core.invoke_lambda import invoke_lambda_async
 from django.conf import settings
 from django_slack.utils import Backend
 
@@ -15,7 +15,7 @@ class LambdaBackend(Backend):
     def send(self, url, message_data, **kwargs):
 
         payload = {"env": settings.ENV_ALIAS, "url": url, "message_data": message_data}
-        ret = invoke_lambda(  # noqa: F841
+        invoke_lambda_async(
             settings.LAMBDA_FUNCTION_NAMES["NotificationSlack"], payload
         )
 
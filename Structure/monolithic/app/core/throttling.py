@@ -4,34 +4,76 @@ Provides various throttling policies.
 
 from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 
+from .caches import RateLimitCache
 
-class AnonDefaultThrottle(AnonRateThrottle):
+
+class ThrottleCache(RateLimitCache):
+    """
+    Hits of the throttles below. DRF's cache keys already hold the scope and
+    the client, the prefix keeps them apart from other rate limits.
+    """
+
+    key_prefix = "throttle"
+
+
+class SlidingWindowThrottleMixin:
+    """
+    Replaces the history list of `SimpleRateThrottle` with `ThrottleCache`,
+    the check and the hit are one atomic Redis call whatever the rate is.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        allowed, _, self.retry_after = ThrottleCache().hit(
+            self.key, self.num_requests, self.duration
+        )
+        return allowed
+
+    def wait(self):
+        return self.retry_after
+
+
+class SlidingWindowAnonRateThrottle(SlidingWindowThrottleMixin, AnonRateThrottle):
+    pass
+
+
+class SlidingWindowUserRateThrottle(SlidingWindowThrottleMixin, UserRateThrottle):
+    pass
+
+
+class AnonDefaultThrottle(SlidingWindowAnonRateThrottle):
     scope = "anon-default"
 
 
-class AnonBurstThrottle(AnonRateThrottle):
+class AnonBurstThrottle(SlidingWindowAnonRateThrottle):
     scope = "anon-burst"
 
 
-class AnonSuppressedThrottle(AnonRateThrottle):
+class AnonSuppressedThrottle(SlidingWindowAnonRateThrottle):
     scope = "anon-suppressed"
 
 
-class UserDefaultThrottle(UserRateThrottle):
+class UserDefaultThrottle(SlidingWindowUserRateThrottle):
     scope = "user-default"
 
 
-class UserBurstThrottle(UserRateThrottle):
+class UserBurstThrottle(SlidingWindowUserRateThrottle):
     scope = "user-burst"
 
 
-class UserSuppressedThrottle(UserRateThrottle):
+class UserSuppressedThrottle(SlidingWindowUserRateThrottle):
     scope = "user-suppressed"
 
 
-class AuthCheckThrottle(AnonRateThrottle):
+class AuthCheckThrottle(SlidingWindowAnonRateThrottle):
     scope = "auth-check"
 
 
-class SMSRequestThrottle(AnonRateThrottle):
+class SMSRequestThrottle(SlidingWindowAnonRateThrottle):
     scope = "sms-request"
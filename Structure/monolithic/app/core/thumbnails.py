@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from easy_thumbnails.conf import settings as thumbnail_settings
+from easy_thumbnails.files import generate_all_aliases, get_thumbnailer
+
+logger = logging.getLogger("django.eventlogger")
+
+
+class ThumbnailGenerator:
+    """
+    Generates all the `THUMBNAIL_ALIASES` of saved images on a thread pool,
+    so no request waits on resizing. Images already queued are skipped.
+    """
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self.lock = threading.Lock()
+        self.executor = None
+        self.executor_pid = None
+        self.queued = set()
+
+    def get_executor(self):
+        # the pool threads do not survive a fork, create one pool per process
+        with self.lock:
+            if self.executor_pid != os.getpid():
+                self.executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="thumbnails"
+                )
+                self.queued = set()
+                self.executor_pid = os.getpid()
+            return self.executor
+
+    def queue(self, instance, field_name):
+        """Queues the thumbnails of `instance.<field_name>` after the commit."""
+        transaction.on_commit(lambda: self.submit(instance, field_name))
+
+    def submit(self, instance, field_name):
+        executor = self.get_executor()
+        key = (instance._meta.label, instance.pk, field_name)
+        with self.lock:
+            if key in self.queued:
+                return
+            self.queued.add(key)
+        executor.submit(self.generate, key)
+
+    def generate(self, key):
+        label, pk, field_name = key
+        try:
+            instance = apps.get_model(label).objects.filter(pk=pk).first()
+            fieldfile = getattr(instance, field_name, None)
+            if fieldfile:
+                generate_all_aliases(fieldfile, include_global=True)
+        except Exception as e:
+            logger.error(f"thumbnail generation error {label} {pk} {field_name}: {e}")
+        finally:
+            with self.lock:
+                self.queued.discard(key)
+            close_old_connections()
+
+
+thumbnail_generator = ThumbnailGenerator(
+    max_workers=settings.THUMBNAIL_GENERATION_WORKERS
+)
+
+
+def existing_thumbnail_url(fieldfile, alias):
+    """
+    Returns the url of the `alias` thumbnail if it was generated already,
+    otherwise queues its generation and returns the url of the original.
+    """
+    if not fieldfile:
+        return ""
+    try:
+        thumbnailer = get_thumbnailer(fieldfile)
+        thumbnailer.generate = False
+        thumbnail = thumbnailer[alias]
+    except Exception as e:
+        if thumbnail_settings.THUMBNAIL_DEBUG:
+            raise e
+        return ""
+    if thumbnail is not None:
+        return thumbnail.url
+
+    instance = getattr(fieldfile, "instance", None)
+    if instance is not None and instance.pk is not None:
+        thumbnail_generator.submit(instance, fieldfile.field.name)
+    return fieldfile.url
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+from django.conf import settings
+from django.utils.translation import ugettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow, datetime_from_epoch
+
+from .caches import CacheBase
+
+BLACKLIST_APP = "rest_framework_simplejwt.token_blacklist"
+
+
+class RevokedTokenCache(CacheBase):
+    """
+    JTIs of revoked tokens, shared by all workers through the cache. Every
+    entry expires together with its token, so the set never outgrows the
+    tokens that are still valid.
+
+    Refresh tokens looked up in the `BlacklistedToken` table and found valid
+    are stored as `0` for `checked_expire_duration` seconds, so a cache miss
+    is never taken for "not revoked".
+    """
+
+    key_prefix = "revokedjti"
+    checked_expire_duration = 60
+
+    def get(self, jti):
+        """`True` or `False` when the cache knows the token, `None` otherwise."""
+        revoked = self.cache_get(jti)
+        return None if revoked is None else bool(revoked)
+
+    def is_revoked(self, jti):
+        return bool(self.cache_get(jti))
+
+    def revoke(self, jti, expires_at):
+        timeout = int((expires_at - aware_utcnow()).total_seconds())
+        if timeout > 0:
+            self.cache_set(jti, 1, expire_duration=timeout)
+
+    def mark_checked(self, jti):
+        # `add` never overwrites a concurrent revoke
+        self.cache.add(self._format_key(jti), 0, self.checked_expire_duration)
+
+
+def is_blacklisted(jti):
+    if BLACKLIST_APP not in settings.INSTALLED_APPS:
+        return False
+
+    from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+    return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+def revoke_token(token):
+    """Revokes an access or refresh token until it expires."""
+    RevokedTokenCache().revoke(
+        token[api_settings.JTI_CLAIM], datetime_from_epoch(token["exp"])
+    )
+
+
+class RevocableRefreshToken(RefreshToken):
+    """
+    Checks the blacklist in `RevokedTokenCache` first and falls back to the
+    `BlacklistedToken` table when the cache does not know the token, after an
+    eviction or a cache outage. Blacklisting writes to both.
+    """
+
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        revoked_token_cache = RevokedTokenCache()
+        revoked = revoked_token_cache.get(jti)
+        if revoked is None:
+            revoked = is_blacklisted(jti)
+            if revoked:
+                revoke_token(self)
+            else:
+                revoked_token_cache.mark_checked(jti)
+        if revoked:
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        blacklisted_token = super().blacklist()
+        revoke_token(self)
+        return blacklisted_token
+
+
+def sync_revoked_tokens(chunk_size=1000):
+    """
+    Loads the unexpired blacklisted tokens into `RevokedTokenCache`. Only
+    warms the cache, refresh tokens missing from it are checked in the table.
+    """
+    if BLACKLIST_APP not in settings.INSTALLED_APPS:
+        return 0
+
+    from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+    revoked_token_cache = RevokedTokenCache()
+    count = 0
+    tokens = (
+        BlacklistedToken.objects.filter(token__expires_at__gt=aware_utcnow())
+        .values_list("token__jti", "token__expires_at")
+        .iterator(chunk_size=chunk_size)
+    )
+    for jti, expires_at in tokens:
+        revoked_token_cache.revoke(jti, expires_at)
+        count += 1
+    return count
+
+
+def purge_expired_tokens(chunk_size=1000):
+    """
+    Deletes expired outstanding tokens and their blacklist entries in chunks,
+    so no single statement locks the tables for long.
+
+    Returns the number of deleted rows and the count per model, like
+    `QuerySet.delete()`.
+    """
+    deleted = {}
+    if BLACKLIST_APP not in settings.INSTALLED_APPS:
+        return 0, deleted
+
+    from rest_framework_simplejwt.token_blacklist.models import (
+        BlacklistedToken,
+        OutstandingToken,
+    )
+
+    now = aware_utcnow()
+    while True:
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=now).values_list(
+                "id", flat=True
+            )[:chunk_size]
+        )
+        if not ids:
+            break
+        for queryset in (
+            BlacklistedToken.objects.filter(token_id__in=ids),
+            OutstandingToken.objects.filter(id__in=ids),
+        ):
+            counts = queryset.delete()[1]
+            for label, count in counts.items():
+                deleted[label] = deleted.get(label, 0) + count
+    return sum(deleted.values()), deleted
@@ -57,6 +57,7 @@ MIDDLEWARE = [
     "django_user_agents.middleware.UserAgentMiddleware",
     "django_guid.middleware.guid_middleware",
     "core.middleware.MMDLoggingMiddleware",
+    "core.profiler.RequestProfilerMiddleware",
 ]
 
 ROOT_URLCONF = "monolith-django.urls"
@@ -143,6 +144,9 @@ AWS_S3_CUSTOM_DOMAIN = AWS_STORAGE_BUCKET_NAME
 CORS_ORIGIN_ALLOW_ALL = True
 AWS_DEFAULT_ACL = "public-read"
 AWS_DEFAULT_REGION = os.getenv("AWS_DEFAULT_REGION", "ap-northeast-2")
+# core.invoke_lambda_async thread pool size and queued invocations limit
+LAMBDA_MAX_WORKERS = 10
+LAMBDA_MAX_PENDING = 1000
 
 CACHE_EXPIRATION_DURATION = 60 * 60 * 24
 
@@ -177,3 +181,12 @@ SKIP_LOGGING_PATH = ["/api/healthcheck/"]
 
 CORS_ALLOWED_ORIGIN_REGEXES = []
 EVENT_BUS_PUSHOPS = "mmd-event-bus"
+# attempts per event when PutEvents reports it as failed
+EVENTS_MAX_ATTEMPTS = 3
+# events queued for the publisher thread, more are dropped
+EVENTS_MAX_PENDING = 10000
+# core.bulk_writer rows per INSERT and seconds a row waits for its batch
+BULK_WRITER_BATCH_SIZE = 500
+BULK_WRITER_FLUSH_INTERVAL = 1
+# rows queued for the writer thread, more are dropped
+BULK_WRITER_MAX_PENDING = 10000
@@ -100,6 +100,9 @@ if FILE_LOGGER:
 
 REQUEST_LOGGING_HTTP_4XX_LOG_LEVEL = logging.WARNING
 
+# share of requests profiled by core.profiler.RequestProfilerMiddleware
+PROFILER_SAMPLE_RATE = float(os.environ.get("PROFILER_SAMPLE_RATE", 0.01))
+
 DJANGO_GUID = {
     "GUID_HEADER_NAME": "Correlation-ID",
     "VALIDATE_GUID": True,
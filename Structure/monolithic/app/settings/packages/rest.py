@@ -28,5 +28,8 @@ REST_FRAMEWORK = {
     "EXCEPTION_HANDLER": "core.exception_handler.custom_exception_handler",
 }
 
+# above this many estimated rows paginated lists return the Postgres estimate
+PAGINATION_ESTIMATE_COUNT_THRESHOLD = 100000
+
 OLD_PASSWORD_FILE_ENABLED = True
 COERCE_DECIMAL_TO_STRING = False
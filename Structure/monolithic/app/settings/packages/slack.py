@@ -1 +1,7 @@
 SLACK_OPS_CHANNEL = "#general"
+
+# core.log.DmmSlackExceptionHandler sends errors from a background thread,
+# repeated errors are grouped per flush and rate limited per fingerprint
+SLACK_REPORT_FLUSH_INTERVAL = 10
+SLACK_REPORT_RATE_LIMIT = 60 * 10
+SLACK_REPORT_MAX_PENDING = 50
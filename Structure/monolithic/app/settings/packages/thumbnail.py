@@ -5,3 +5,5 @@ THUMBNAIL_ALIASES = {
     },
 }
 THUMBNAIL_DEFAULT_STORAGE = "storages.backends.s3boto3.S3Boto3Storage"
+# threads generating the thumbnails of saved images, see core.thumbnails
+THUMBNAIL_GENERATION_WORKERS = 2
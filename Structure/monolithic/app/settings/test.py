@@ -44,6 +44,11 @@ DATABASES = {
         "NAME": BASE_DIR / "testdb.sqlite3",
     }
 }
+
+# the caches are exercised by tests, conftest clears it before each test
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
 REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] = {
     "anon-default": "100/minute",
     "anon-burst": "100/minute",
@@ -29,6 +29,11 @@ class CustomClient(APIClient):
         return response
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
 @pytest.fixture(name="rf")
 def request_factory():
     return APIRequestFactory()
@@ -0,0 +1,54 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.shortcuts import resolve_url
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from tests.conftest import CustomClient
+from tests.schemas.auth_schemas import signup_schema
+from user.caches import UserProfileCache
+from user.models import UserProfileStaff
+
+CustomUser = get_user_model()
+
+
+@pytest.mark.django_db
+class TestSignup:
+    schema = signup_schema
+
+    def test_signup(self, phonenumbers):
+        url = resolve_url("signup")
+        client = CustomClient()
+        phonenumber = phonenumbers["new_user"]
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(
+                url,
+                {"phonenumber": phonenumber, "user_type": CustomUser.Types.STAFF},
+            )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        user = CustomUser.objects.get(phonenumber=phonenumber)
+        profile = UserProfileStaff.objects.get(user=user)
+        response_up = response.json()["user_profile"]
+        assert response.json()["uuid"] == str(user.uuid)
+        assert response_up["uuid"] == str(user.uuid)
+        assert response_up["phonenumber"] == phonenumber
+        assert response_up["fullname"] == profile.fullname
+        assert response_up["type"] == CustomUser.Types.STAFF
+
+        # the user is looked up once by the serializer and the profile only
+        # inserted, neither is read back for the response
+        selects = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+        ]
+        assert not [sql for sql in selects if UserProfileStaff._meta.db_table in sql]
+        assert len([sql for sql in selects if '."phonenumber" = ' in sql]) == 1
+
+        # the response primed the profile cache
+        with CaptureQueriesContext(connection) as queries:
+            cached_up = UserProfileCache().get(user.uuid)
+        assert len(queries) == 0
+        assert str(cached_up["uuid"]) == str(user.uuid)
+        assert cached_up["fullname"] == response_up["fullname"]
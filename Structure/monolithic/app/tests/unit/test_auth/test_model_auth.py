@@ -0,0 +1,72 @@
+import datetime
+from unittest import mock
+
+from auth.models import PhonenumberCheck
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+
+@override_settings(PHONENUMBER_EXPIRATION=3)
+class PhonenumberCheckUnitTests(TestCase):
+    phonenumber = "+821012345678"
+
+    def setUp(self):
+        patcher = mock.patch("auth.models.AuthEventsEmitter.send_verification_code")
+        self.send_verification_code = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assert_requested(self, timestamp_expires):
+        phonenumber_check = PhonenumberCheck.objects.get(phonenumber=self.phonenumber)
+        self.assertFalse(phonenumber_check.verified)
+        self.assertEqual(phonenumber_check.token, PhonenumberCheck.generate_token())
+        self.assertEqual(
+            timestamp_expires,
+            phonenumber_check.timestamp_requested + datetime.timedelta(minutes=3),
+        )
+        self.send_verification_code.assert_called_once_with(
+            PhonenumberCheck.generate_token(), self.phonenumber
+        )
+
+    def test_first_request_creates_row(self):
+        timestamp_expires = PhonenumberCheck.request_verification(self.phonenumber)
+        self.assert_requested(timestamp_expires)
+
+    def test_known_phonenumber_is_updated(self):
+        PhonenumberCheck.objects.create(
+            phonenumber=self.phonenumber, token="0000", verified=True
+        )
+        PhonenumberCheck.objects.update(
+            timestamp_requested=timezone.now() - datetime.timedelta(days=1)
+        )
+
+        with self.assertNumQueries(1):
+            timestamp_expires = PhonenumberCheck.request_verification(
+                self.phonenumber
+            )
+        self.assert_requested(timestamp_expires)
+        self.assertGreater(timestamp_expires, timezone.now())
+
+    def test_concurrently_created_row_is_updated(self):
+        def atomic(*args, **kwargs):
+            # another request inserts the row between the UPDATE and INSERT,
+            # outside of the savepoint the INSERT runs in
+            PhonenumberCheck.objects.create(phonenumber=self.phonenumber, token="0000")
+            return transaction.atomic(*args, **kwargs)
+
+        with mock.patch(
+            "auth.models.transaction", mock.Mock(atomic=mock.Mock(side_effect=atomic))
+        ):
+            timestamp_expires = PhonenumberCheck.request_verification(
+                self.phonenumber
+            )
+        self.assertEqual(PhonenumberCheck.objects.count(), 1)
+        self.assert_requested(timestamp_expires)
+
+    def test_unstored_row_raises(self):
+        with mock.patch.object(
+            PhonenumberCheck.objects, "create", side_effect=IntegrityError
+        ):
+            with self.assertRaises(IntegrityError):
+                PhonenumberCheck.request_verification(self.phonenumber)
+        self.send_verification_code.assert_not_called()
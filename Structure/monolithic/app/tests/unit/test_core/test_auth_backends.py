@@ -0,0 +1,46 @@
+from core.auth_backends import AuthenticationBackend, PasswordlessAuthenticationBackend
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+CustomUser = get_user_model()
+
+
+class AuthenticationBackendUnitTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create(
+            username="backend", phonenumber="+821012345678"
+        )
+        self.user.set_password("password")
+        self.user.save()
+
+    def test_authenticate(self):
+        backend = AuthenticationBackend()
+        user = backend.authenticate(
+            None, phonenumber="+821012345678", password="password"
+        )
+        self.assertEqual(user, self.user)
+        self.assertIsNone(
+            backend.authenticate(None, phonenumber="+821012345678", password="wrong")
+        )
+
+    def test_inactive_user_is_stashed(self):
+        self.user.is_active = False
+        self.user.save()
+        backend = AuthenticationBackend()
+
+        user = backend.authenticate(
+            None, phonenumber="+821012345678", password="password"
+        )
+        self.assertIsNone(user)
+        self.assertEqual(backend.unstash_authenticated_user(), self.user)
+
+    def test_unknown_phonenumber_is_cached(self):
+        backend = PasswordlessAuthenticationBackend()
+        self.assertIsNone(backend.authenticate(None, "+821099999999", True))
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(backend.authenticate(None, "+821099999999", True))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            CustomUser.objects.create(username="new", phonenumber="+821099999999")
+        self.assertIsNotNone(backend.authenticate(None, "+821099999999", True))
@@ -0,0 +1,53 @@
+from core.authentication import MMDJWTAuthentication
+from core.caches import UserPrincipalCache
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+CustomUser = get_user_model()
+
+
+class MMDJWTAuthenticationUnitTests(TestCase):
+    def setUp(self):
+        UserPrincipalCache._l1.clear()
+        self.user = CustomUser.objects.create(username="principal")
+        self.token = {api_settings.USER_ID_CLAIM: self.user.id}
+
+    def test_cached_user(self):
+        MMDJWTAuthentication().get_user(self.token)
+        UserPrincipalCache._l1.clear()
+
+        with self.assertNumQueries(0):
+            user = MMDJWTAuthentication().get_user(self.token)
+            self.assertEqual(user.uuid, self.user.uuid)
+            self.assertEqual(user, self.user)
+            self.assertFalse(user != self.user)
+            self.assertNotEqual(user, "principal")
+            self.assertTrue(user.is_authenticated)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(user.username, "principal")
+
+    def test_banned_user_is_invalidated(self):
+        MMDJWTAuthentication().get_user(self.token)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.banned = True
+            self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            MMDJWTAuthentication().get_user(self.token)
+
+    def test_user_not_found(self):
+        with self.assertRaises(AuthenticationFailed):
+            MMDJWTAuthentication().get_user({api_settings.USER_ID_CLAIM: 0})
+
+    def test_invalidated_after_commit(self):
+        MMDJWTAuthentication().get_user(self.token)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.banned = True
+            self.user.save()
+            # the uncommitted change is not visible to other requests yet
+            self.assertIsNotNone(UserPrincipalCache().cache_get(self.user.id))
+
+        self.assertIsNone(UserPrincipalCache().cache_get(self.user.id))
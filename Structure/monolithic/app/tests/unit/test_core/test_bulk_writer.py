@@ -0,0 +1,40 @@
+from unittest import mock
+
+from auth.models import PhonenumberVerificationLog
+from core.bulk_writer import BulkCreateWriter
+from django.test import TestCase
+
+
+class BulkCreateWriterUnitTests(TestCase):
+    def log(self, phonenumber):
+        return PhonenumberVerificationLog(
+            phonenumber=phonenumber,
+            type=PhonenumberVerificationLog.VerificationType.SIGNIN,
+        )
+
+    def test_flush_writes_one_batch(self):
+        writer = BulkCreateWriter(PhonenumberVerificationLog, batch_size=10)
+        with mock.patch.object(writer, "start_worker"):
+            writer.append(self.log("+821012345678"))
+            writer.append(self.log("+821012345679"))
+
+        with self.assertNumQueries(1):
+            writer.flush()
+        self.assertEqual(PhonenumberVerificationLog.objects.count(), 2)
+
+    def test_rows_over_max_pending_are_dropped(self):
+        writer = BulkCreateWriter(PhonenumberVerificationLog, max_pending=1)
+        with mock.patch.object(writer, "start_worker"):
+            writer.append(self.log("+821012345678"))
+            writer.append(self.log("+821012345679"))
+
+        writer.flush()
+        self.assertEqual(
+            [str(log.phonenumber) for log in PhonenumberVerificationLog.objects.all()],
+            ["+821012345678"],
+        )
+
+    def test_unbuffered_writes_immediately(self):
+        writer = BulkCreateWriter(PhonenumberVerificationLog, buffered=False)
+        writer.append(self.log("+821012345678"))
+        self.assertEqual(PhonenumberVerificationLog.objects.count(), 1)
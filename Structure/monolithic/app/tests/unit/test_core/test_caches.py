@@ -0,0 +1,85 @@
+from unittest import mock
+
+from core.caches import PaginationCache, RateLimitCache
+from django.test import TestCase
+
+
+class ListPaginationCache(PaginationCache):
+    key_prefix = "test_pagination"
+
+    def __init__(self, items):
+        super().__init__()
+        self.items = items
+
+    def get_from_db(self, key, *args, **kwargs):
+        return list(self.items)
+
+    def get_item(self, key):
+        return key
+
+
+class PaginationCacheUnitTests(TestCase):
+    def test_get_page_slice(self):
+        pagination_cache = ListPaginationCache(["a", "b", "c"])
+        self.assertEqual(pagination_cache.get("list", 1, page_size=2), ["a", "b"])
+        self.assertEqual(pagination_cache.get("list", 2, page_size=2), ["c"])
+        self.assertEqual(pagination_cache.get("list", 3, page_size=2), [])
+
+    def test_snapshot_is_honored(self):
+        pagination_cache = ListPaginationCache(["a", "b", "c"])
+        page, snapshot_id = pagination_cache.get_page("list", 1, page_size=2)
+        self.assertEqual(page, ["a", "b"])
+
+        # a rebuild creates a new snapshot, the old one stays readable
+        pagination_cache.items = ["z", "a", "b", "c"]
+        pagination_cache.build_snapshot("list")
+
+        page, same_snapshot_id = pagination_cache.get_page(
+            "list", 2, page_size=2, snapshot_id=snapshot_id
+        )
+        self.assertEqual(page, ["c"])
+        self.assertEqual(same_snapshot_id, snapshot_id)
+
+        page, new_snapshot_id = pagination_cache.get_page("list", 2, page_size=2)
+        self.assertEqual(page, ["b", "c"])
+        self.assertNotEqual(new_snapshot_id, snapshot_id)
+
+    def test_unknown_snapshot_falls_back_to_current(self):
+        pagination_cache = ListPaginationCache(["a", "b"])
+        page, snapshot_id = pagination_cache.get_page(
+            "list", 1, page_size=2, snapshot_id="expired"
+        )
+        self.assertEqual(page, ["a", "b"])
+        self.assertNotEqual(snapshot_id, "expired")
+
+
+class RateLimitCacheUnitTests(TestCase):
+    def test_hit_limit(self):
+        rate_limit_cache = RateLimitCache()
+        self.assertEqual(rate_limit_cache.hit("key", 2, 60), (True, 1, 0))
+        self.assertEqual(rate_limit_cache.hit("key", 2, 60), (True, 2, 0))
+        allowed, count, retry_after = rate_limit_cache.hit("key", 2, 60)
+        self.assertFalse(allowed)
+        self.assertEqual(count, 2)
+        self.assertGreater(retry_after, 0)
+        self.assertEqual(rate_limit_cache.count("key", 60), 2)
+
+    def test_window_slides(self):
+        rate_limit_cache = RateLimitCache()
+        with mock.patch("core.caches.rate_limit_cache.time.time", return_value=1000):
+            rate_limit_cache.hit("key", 1, 60)
+        with mock.patch("core.caches.rate_limit_cache.time.time", return_value=1030):
+            self.assertFalse(rate_limit_cache.hit("key", 1, 60)[0])
+        with mock.patch("core.caches.rate_limit_cache.time.time", return_value=1061):
+            self.assertTrue(rate_limit_cache.hit("key", 1, 60)[0])
+
+    def test_redis_script_registered_once(self):
+        redis = mock.Mock()
+        redis.register_script.return_value.return_value = [0, 2, 1500]
+        rate_limit_cache = RateLimitCache()
+        with mock.patch.object(RateLimitCache, "_script", None), mock.patch.object(
+            rate_limit_cache, "_redis_client", return_value=redis
+        ):
+            self.assertEqual(rate_limit_cache.hit("key", 2, 60), (False, 2, 1.5))
+            rate_limit_cache.hit("key", 2, 60)
+        redis.register_script.assert_called_once()
@@ -0,0 +1,98 @@
+from unittest import mock
+
+from core.events import BaseEventsEmitter, EventsPublisher, LocalEventsClient
+from django.db import transaction
+from django.test import TestCase
+
+
+class EventsEmitter(BaseEventsEmitter):
+    SOURCE = "mmd.api.test"
+
+
+class EventsPublisherUnitTests(TestCase):
+    def setUp(self):
+        self.client = LocalEventsClient()
+        self.publisher = EventsPublisher(client=self.client, max_attempts=2)
+        mock.patch.object(self.publisher, "start_worker").start()
+        mock.patch("core.events.publisher", self.publisher).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_events_are_sent_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic():
+                EventsEmitter().emit_eventbridge("First", {"id": 1})
+                EventsEmitter().emit_eventbridge("Second", {"id": 2})
+                self.assertEqual(self.publisher.queue.qsize(), 0)
+
+        self.assertEqual(len(callbacks), 2)
+        for callback in callbacks:
+            callback()
+        self.publisher.flush()
+        self.assertEqual(
+            [entry["DetailType"] for entry in self.client.entries],
+            ["First", "Second"],
+        )
+
+    def test_events_of_rolled_back_savepoint_are_dropped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                EventsEmitter().emit_eventbridge("Kept", {"id": 1})
+                try:
+                    with transaction.atomic():
+                        EventsEmitter().emit_eventbridge("Dropped", {"id": 2})
+                        raise ValueError
+                except ValueError:
+                    pass
+
+        self.publisher.flush()
+        self.assertEqual(
+            [entry["DetailType"] for entry in self.client.entries], ["Kept"]
+        )
+
+    def test_entries_over_max_pending_are_dropped(self):
+        publisher = EventsPublisher(client=self.client, max_pending=2)
+        with mock.patch.object(publisher, "start_worker"):
+            publisher.publish(
+                [{"DetailType": str(i), "Detail": "{}"} for i in range(3)]
+            )
+        publisher.flush()
+
+        self.assertEqual(
+            [entry["DetailType"] for entry in self.client.entries], ["0", "1"]
+        )
+
+    def test_local_client_keeps_last_entries(self):
+        client = LocalEventsClient(max_entries=2)
+        client.put_events(
+            Entries=[{"DetailType": str(i), "Detail": "{}"} for i in range(3)]
+        )
+        self.assertEqual([entry["DetailType"] for entry in client.entries], ["1", "2"])
+
+    def test_batches_of_ten(self):
+        self.publisher.publish(
+            [{"DetailType": str(i), "Detail": "{}"} for i in range(25)]
+        )
+        with mock.patch.object(
+            self.client, "put_events", wraps=self.client.put_events
+        ) as put_events:
+            self.publisher.flush()
+
+        self.assertEqual(
+            [len(call.kwargs["Entries"]) for call in put_events.call_args_list],
+            [10, 10, 5],
+        )
+
+    def test_failed_entries_are_retried(self):
+        self.client.fail_next = 3
+        self.publisher.publish(
+            [
+                {"DetailType": "Dropped", "Detail": "{}", "EventBusName": "bus"},
+                {"DetailType": "Retried", "Detail": "{}", "EventBusName": "bus"},
+            ]
+        )
+        self.publisher.flush()
+
+        # both fail once, then "Dropped" fails its last attempt
+        self.assertEqual(
+            [entry["DetailType"] for entry in self.client.entries], ["Retried"]
+        )
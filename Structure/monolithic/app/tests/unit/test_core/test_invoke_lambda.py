@@ -0,0 +1,46 @@
+import threading
+from unittest import mock
+
+from core.invoke_lambda import LambdaInvoker
+from django.test import SimpleTestCase
+
+
+@mock.patch("core.invoke_lambda.LAMBDA_CLIENT")
+class LambdaInvokerUnitTests(SimpleTestCase):
+    def test_invoke(self, client):
+        client.invoke.return_value = {"StatusCode": 202}
+        future = LambdaInvoker(max_workers=2, max_pending=2).submit("fn", {"a": 1})
+
+        self.assertEqual(future.result(timeout=5), {"StatusCode": 202})
+        client.invoke.assert_called_once_with(
+            FunctionName="fn", InvocationType="DryRun", Payload='{"a": 1}'
+        )
+
+    def test_failure_callback(self, client):
+        client.invoke.side_effect = ValueError("boom")
+        failed = threading.Event()
+        on_failure = mock.Mock(side_effect=lambda error: failed.set())
+        LambdaInvoker(max_workers=1, max_pending=1).submit(
+            "fn", {}, on_failure=on_failure
+        )
+
+        self.assertTrue(failed.wait(5))
+        self.assertIsInstance(on_failure.call_args[0][0], ValueError)
+
+    def test_rejected_when_full(self, client):
+        started, release = threading.Event(), threading.Event()
+
+        def invoke(**kwargs):
+            started.set()
+            release.wait(5)
+            return {"StatusCode": 202}
+
+        client.invoke.side_effect = invoke
+        invoker = LambdaInvoker(max_workers=1, max_pending=1)
+        invoker.submit("fn", {})
+        started.wait(5)
+        on_failure = mock.Mock()
+
+        self.assertIsNone(invoker.submit("fn", {}, on_failure=on_failure))
+        self.assertIsInstance(on_failure.call_args[0][0], RuntimeError)
+        release.set()
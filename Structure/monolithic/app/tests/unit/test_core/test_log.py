@@ -0,0 +1,67 @@
+import logging
+import sys
+from unittest import mock
+
+from core.log import DmmSlackExceptionHandler
+from django.test import RequestFactory, SimpleTestCase
+
+
+def make_record(msg="Internal Server Error"):
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        return logging.LogRecord(
+            "django.request", logging.ERROR, __file__, 1, msg, (), sys.exc_info()
+        )
+
+
+@mock.patch.object(DmmSlackExceptionHandler, "start_worker")
+@mock.patch.object(DmmSlackExceptionHandler, "send_message")
+class DmmSlackExceptionHandlerUnitTests(SimpleTestCase):
+    def test_same_error_is_sent_once_per_flush(self, send_message, start_worker):
+        handler = DmmSlackExceptionHandler()
+        for _ in range(3):
+            handler.emit(make_record())
+        handler.flush()
+
+        self.assertEqual(send_message.call_count, 1)
+        self.assertIn("(x3 in", send_message.call_args[0][1]["text"])
+
+    def test_rate_limited_errors_are_sent_as_digest(self, send_message, start_worker):
+        handler = DmmSlackExceptionHandler()
+        handler.emit(make_record())
+        handler.flush()
+        handler.emit(make_record())
+        handler.emit(make_record())
+        handler.flush()
+
+        self.assertEqual(send_message.call_count, 2)
+        self.assertIn("2 rate limited errors", send_message.call_args[0][1]["text"])
+
+    def test_request_is_snapshotted(self, send_message, start_worker):
+        request = RequestFactory().post("/path/?page=1", {"field": "value"})
+        request.user = "user"
+        record = make_record()
+        record.request = request
+
+        handler = DmmSlackExceptionHandler()
+        handler.emit(record)
+        report = next(iter(handler.pending.values()))
+
+        self.assertIsNot(report.request, request)
+        self.assertIs(report.record.request, report.request)
+        self.assertEqual(report.request.path, "/path/")
+        self.assertEqual(report.request.GET["page"], "1")
+        self.assertEqual(report.request.POST["field"], "value")
+        self.assertNotIn("wsgi.input", report.request.META)
+
+    def test_digest_failure_is_reported(self, send_message, start_worker):
+        handler = DmmSlackExceptionHandler()
+        handler.emit(make_record())
+        handler.flush()
+        handler.emit(make_record())
+
+        send_message.side_effect = RuntimeError("slack down")
+        with mock.patch.object(handler, "handleError") as handle_error:
+            handler.flush()
+        handle_error.assert_called_once()
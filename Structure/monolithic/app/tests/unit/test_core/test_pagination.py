@@ -0,0 +1,97 @@
+from unittest import mock
+
+from core.pagination import (
+    CachedCountStrategy,
+    CountStrategyPaginator,
+    MMDPageNumberPagination,
+)
+from django.core.paginator import EmptyPage
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+from rest_framework.request import Request
+from user.models import UserStaff
+
+CustomUser = get_user_model()
+
+
+class MMDPageNumberPaginationUnitTests(TestCase):
+    def setUp(self):
+        for index in range(3):
+            CustomUser.objects.create(username=f"pagination-{index}")
+        self.queryset = CustomUser.objects.filter(
+            username__startswith="pagination-"
+        ).order_by("id")
+
+    def paginate(self, url):
+        paginator = MMDPageNumberPagination()
+        request = Request(RequestFactory().get(url))
+        page = paginator.paginate_queryset(self.queryset, request)
+        return paginator, page
+
+    def test_count_is_cached(self):
+        paginator, _ = self.paginate("/?page_size=1")
+        self.assertEqual(paginator.page.paginator.count, self.queryset.count())
+
+        # the second request only reads the page
+        with self.assertNumQueries(1):
+            paginator, _ = self.paginate("/?page_size=1")
+            self.assertEqual(paginator.page.paginator.count, self.queryset.count())
+
+    def test_count_opt_out(self):
+        with self.assertNumQueries(1):
+            paginator, page = self.paginate("/?page_size=2&count=false")
+        response = paginator.get_paginated_response([])
+        self.assertIsNone(response.data["count"])
+        self.assertEqual(len(page), 2)
+        self.assertIsNotNone(response.data["next"])
+
+    def test_countless_last_page(self):
+        paginator, page = self.paginate("/?page_size=2&page=2&count=false")
+        response = paginator.get_paginated_response([])
+        self.assertEqual(len(page), self.queryset.count() - 2)
+        self.assertIsNone(response.data["next"])
+        self.assertIsNotNone(response.data["previous"])
+
+    def test_exact_count_by_default(self):
+        paginator = CountStrategyPaginator(self.queryset, 2)
+        self.assertEqual(paginator.count, self.queryset.count())
+
+    def test_pages_do_not_depend_on_count(self):
+        class WrongCountStrategy:
+            def __init__(self, count):
+                self.wrong_count = count
+
+            def count(self, queryset):
+                return self.wrong_count
+
+        # underestimated, the trailing page is still served
+        paginator = CountStrategyPaginator(self.queryset, 2, WrongCountStrategy(1))
+        page = paginator.page(2)
+        self.assertEqual(len(page), 1)
+        self.assertFalse(page.has_next())
+
+        # overestimated, no next link to empty pages
+        paginator = CountStrategyPaginator(self.queryset, 2, WrongCountStrategy(100))
+        self.assertFalse(paginator.page(2).has_next())
+        with self.assertRaises(EmptyPage):
+            paginator.page(3)
+
+    def test_count_cache_dropped_on_write(self):
+        paginator, _ = self.paginate("/?page_size=1")
+        CustomUser.objects.create(username="pagination-3")
+
+        paginator, _ = self.paginate("/?page_size=1")
+        self.assertEqual(paginator.page.paginator.count, 4)
+
+    def test_count_cache_dropped_on_proxy_write(self):
+        paginator, _ = self.paginate("/?page_size=1")
+        UserStaff.objects.create(username="pagination-3")
+
+        paginator, _ = self.paginate("/?page_size=1")
+        self.assertEqual(paginator.page.paginator.count, 4)
+
+    def test_last_page_uses_exact_count(self):
+        with mock.patch.object(CachedCountStrategy, "estimate", return_value=100):
+            paginator, page = self.paginate("/?page_size=2&page=last")
+        self.assertEqual(page, list(self.queryset)[2:])
+        self.assertEqual(paginator.page.paginator.count, self.queryset.count())
@@ -0,0 +1,39 @@
+from core.caches import NewBadgeCache
+from core.profiler import RequestProfilerMiddleware
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+CustomUser = get_user_model()
+
+
+def view(request):
+    CustomUser.objects.exists()
+    badge_cache = NewBadgeCache()
+    badge_cache.set("profiled", True)
+    badge_cache.get("profiled")
+    badge_cache.get("missing")
+    return HttpResponse()
+
+
+class RequestProfilerMiddlewareUnitTests(TestCase):
+    @override_settings(PROFILER_SAMPLE_RATE=1)
+    def test_sampled_request(self):
+        request = RequestFactory().get("/")
+        response = RequestProfilerMiddleware(view)(request)
+
+        self.assertEqual(request.profile["db_queries"], 1)
+        self.assertEqual(request.profile["cache_NewBadgeCache_hits"], 1)
+        self.assertEqual(request.profile["cache_NewBadgeCache_misses"], 1)
+        self.assertIn('db;dur=', response["Server-Timing"])
+        self.assertIn(
+            'cache-NewBadgeCache;desc="hits=1 misses=1"', response["Server-Timing"]
+        )
+
+    @override_settings(PROFILER_SAMPLE_RATE=0)
+    def test_request_not_sampled(self):
+        request = RequestFactory().get("/")
+        response = RequestProfilerMiddleware(view)(request)
+
+        self.assertFalse(hasattr(request, "profile"))
+        self.assertFalse(response.has_header("Server-Timing"))
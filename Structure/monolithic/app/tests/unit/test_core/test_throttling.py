@@ -0,0 +1,36 @@
+from core.throttling import SlidingWindowAnonRateThrottle
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+
+
+class TwoPerMinuteThrottle(SlidingWindowAnonRateThrottle):
+    rate = "2/minute"
+
+
+class SlidingWindowThrottleUnitTests(TestCase):
+    def setUp(self):
+        self.request = APIRequestFactory().get("/")
+        self.request.user = AnonymousUser()
+
+    def test_throttled_after_rate(self):
+        self.assertTrue(TwoPerMinuteThrottle().allow_request(self.request, None))
+        self.assertTrue(TwoPerMinuteThrottle().allow_request(self.request, None))
+
+        throttle = TwoPerMinuteThrottle()
+        self.assertFalse(throttle.allow_request(self.request, None))
+        self.assertGreater(throttle.wait(), 0)
+        self.assertLessEqual(throttle.wait(), 60)
+
+    def test_clients_are_throttled_separately(self):
+        other_request = APIRequestFactory().get("/", REMOTE_ADDR="10.0.0.1")
+        other_request.user = AnonymousUser()
+        for _ in range(2):
+            TwoPerMinuteThrottle().allow_request(self.request, None)
+        self.assertTrue(TwoPerMinuteThrottle().allow_request(other_request, None))
+
+    def test_hits_are_stored_under_throttle_prefix(self):
+        throttle = TwoPerMinuteThrottle()
+        throttle.allow_request(self.request, None)
+        self.assertEqual(len(cache.get(f"throttle:{throttle.key}")), 1)
@@ -0,0 +1,49 @@
+from unittest import mock
+
+from core.serializers import ThumbnailSerializer
+from core.thumbnails import ThumbnailGenerator
+from django.test import SimpleTestCase
+
+
+class ThumbnailSerializerUnitTests(SimpleTestCase):
+    def setUp(self):
+        self.fieldfile = mock.MagicMock(url="/media/original.jpg")
+        self.fieldfile.instance.pk = 1
+        self.fieldfile.field.name = "image"
+
+    @mock.patch("core.thumbnails.thumbnail_generator")
+    @mock.patch("core.thumbnails.get_thumbnailer")
+    def test_existing_thumbnail(self, get_thumbnailer, thumbnail_generator):
+        get_thumbnailer.return_value.__getitem__.return_value.url = "/media/medium.jpg"
+
+        url = ThumbnailSerializer().to_representation(self.fieldfile)
+
+        self.assertEqual(url, "/media/medium.jpg")
+        thumbnail_generator.submit.assert_not_called()
+
+    @mock.patch("core.thumbnails.thumbnail_generator")
+    @mock.patch("core.thumbnails.get_thumbnailer")
+    def test_fallback_to_original(self, get_thumbnailer, thumbnail_generator):
+        get_thumbnailer.return_value.__getitem__.return_value = None
+
+        url = ThumbnailSerializer().to_representation(self.fieldfile)
+
+        self.assertEqual(url, "/media/original.jpg")
+        self.assertFalse(get_thumbnailer.return_value.generate)
+        thumbnail_generator.submit.assert_called_once_with(
+            self.fieldfile.instance, "image"
+        )
+
+
+class ThumbnailGeneratorUnitTests(SimpleTestCase):
+    def test_queued_once(self):
+        generator = ThumbnailGenerator(max_workers=1)
+        instance = mock.Mock(pk=1)
+        instance._meta.label = "user.UserProfileStaff"
+        with mock.patch.object(generator, "get_executor") as get_executor:
+            generator.submit(instance, "image")
+            generator.submit(instance, "image")
+
+        get_executor.return_value.submit.assert_called_once_with(
+            generator.generate, ("user.UserProfileStaff", 1, "image")
+        )
@@ -0,0 +1,46 @@
+from unittest import mock
+
+from core.authentication import MMDJWTAuthentication
+from core.tokens import RevocableRefreshToken, RevokedTokenCache, revoke_token
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+
+CustomUser = get_user_model()
+
+
+class RevokedTokenUnitTests(TestCase):
+    def setUp(self):
+        user = CustomUser.objects.create(username="revoked")
+        self.token = AccessToken.for_user(user)
+        self.refresh_token = RevocableRefreshToken.for_user(user)
+
+    def test_revoked_access_token_is_rejected(self):
+        raw_token = str(self.token).encode()
+        authentication = MMDJWTAuthentication()
+        authentication.get_validated_token(raw_token)
+
+        revoke_token(self.token)
+
+        self.assertTrue(RevokedTokenCache().is_revoked(self.token["jti"]))
+        with self.assertNumQueries(0), self.assertRaises(InvalidToken):
+            authentication.get_validated_token(raw_token)
+
+    @mock.patch("core.tokens.is_blacklisted", return_value=True)
+    def test_cache_miss_checks_blacklist_table(self, is_blacklisted):
+        with self.assertRaises(TokenError):
+            self.refresh_token.check_blacklist()
+        with self.assertRaises(TokenError):
+            self.refresh_token.check_blacklist()
+        is_blacklisted.assert_called_once_with(self.refresh_token["jti"])
+
+    @mock.patch("core.tokens.is_blacklisted", return_value=False)
+    def test_checked_token_can_be_revoked(self, is_blacklisted):
+        self.refresh_token.check_blacklist()
+        self.refresh_token.check_blacklist()
+        is_blacklisted.assert_called_once()
+
+        revoke_token(self.refresh_token)
+        with self.assertRaises(TokenError):
+            self.refresh_token.check_blacklist()
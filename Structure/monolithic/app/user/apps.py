@@ -7,3 +7,22 @@ class UserConfig(AppConfig):
 
     def ready(self):
         admin.site.disable_action("delete_selected")
+
+        from core.caches.user_principal_cache import delete_user_principal_cache
+        from django.db.models.signals import post_save
+
+        from .caches import delete_unknown_phonenumber_cache
+        from .models import CustomUser, UserDriver, UserStaff
+
+        # ban, unregister and admin edits all save the user
+        for model in (CustomUser, UserStaff, UserDriver):
+            post_save.connect(
+                delete_user_principal_cache,
+                sender=model,
+                dispatch_uid=f"delete_user_principal_cache_{model.__name__}",
+            )
+            post_save.connect(
+                delete_unknown_phonenumber_cache,
+                sender=model,
+                dispatch_uid=f"delete_unknown_phonenumber_cache_{model.__name__}",
+            )
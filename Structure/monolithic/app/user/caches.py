@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 
-from core.caches import ModelCacheBase
+from core.caches import CacheBase, ModelCacheBase
 from django.contrib.auth import get_user_model
+from django.db import transaction
 
 from .utils_user import get_proxy_userprofile_model, get_proxy_userprofile_serializer
 
@@ -31,3 +32,36 @@ class UserProfileCache(ModelCacheBase):
             user__uuid=key, defaults={"user": user}
         )
         return profile
+
+    def prime(self, user, profile):
+        """Write-through of a profile just saved, returns its cached data."""
+        self.user_instance = user
+        data = self.serialize(profile)
+        self.cache_set(user.uuid, data)
+        return self.to_cache_representation(data)
+
+
+class UnknownPhonenumberCache(CacheBase):
+    """
+    Phonenumbers no user is registered with, so repeated sign in attempts
+    for them skip the users table. Cleared when a user saves the number.
+    """
+
+    expire_duration = 60 * 5
+    key_prefix = "unknownphonenumber"
+
+    def get(self, phonenumber):
+        return self.cache_get(str(phonenumber))
+
+    def set(self, phonenumber):
+        self.cache_set(str(phonenumber), True)
+
+    def delete(self, phonenumber):
+        super().delete(str(phonenumber))
+
+
+def delete_unknown_phonenumber_cache(sender, instance, **kwargs):
+    # a lookup before the commit would cache the number as unknown again
+    phonenumber = instance.phonenumber
+    if phonenumber:
+        transaction.on_commit(lambda: UnknownPhonenumberCache().delete(phonenumber))
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List, Union
+from typing import List, Optional, Union
 
 from core.selector import Selector
 from django.contrib.auth import get_user_model
@@ -25,5 +25,22 @@ class UserSelector(Selector):
         users = list(User.objects.filter(phonenumber=phonenumber))
         return list(set(users))
 
+    @staticmethod
+    def get_user_by_phonenumber(phonenumber) -> Optional[CustomUser]:
+        """
+        Single row lookup on the unique phonenumber index, unknown numbers
+        are remembered in `UnknownPhonenumberCache` for a few minutes.
+        """
+        from .caches import UnknownPhonenumberCache
+
+        unknown_phonenumber_cache = UnknownPhonenumberCache()
+        if unknown_phonenumber_cache.get(phonenumber):
+            return None
+        try:
+            return User.objects.get(phonenumber=phonenumber)
+        except User.DoesNotExist:
+            unknown_phonenumber_cache.set(phonenumber)
+            return None
+
 
 user_selector = UserSelector()
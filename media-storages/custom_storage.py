@@ -1,5 +1,18 @@
+import os
+import posixpath
+import threading
+import time
+from collections import OrderedDict
+
+from boto3.s3.transfer import TransferConfig
 from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.db.models import Q
+from django.utils.text import get_valid_filename
 from storages.backends.s3boto3 import S3Boto3Storage
+from storages.utils import clean_name
+
+MB = 1024 * 1024
 
 
 class MediaStorage(S3Boto3Storage):
@@ -41,6 +54,116 @@ class MediaStorage(S3Boto3Storage):
     bucket_name = settings.AWS_STORAGE_BUCKET_NAME
     location = "media"
     file_overwrite = True
+    # files above the threshold are streamed in parts uploaded concurrently,
+    # 10 threads match the default connection pool size of botocore
+    transfer_config = TransferConfig(
+        multipart_threshold=8 * MB,
+        multipart_chunksize=8 * MB,
+        max_concurrency=10,
+        use_threads=True,
+    )
+    presigned_upload_expire = 10 * 60
+    presigned_upload_max_size = 100 * MB
+    # signed urls are reused until `url_cache_margin` seconds before expiry
+    url_cache_size = 10000
+    url_cache_margin = 60
+
+    def __init__(self, **kwargs):
+        # buckets readable through a public CDN domain get plain unsigned
+        # urls, without the setting `AWS_QUERYSTRING_AUTH` applies
+        if hasattr(settings, "MEDIA_STORAGE_PUBLIC_READ"):
+            kwargs.setdefault(
+                "querystring_auth", not settings.MEDIA_STORAGE_PUBLIC_READ
+            )
+        super().__init__(**kwargs)
+        self._url_cache = OrderedDict()
+        self._url_cache_lock = threading.Lock()
+        self.url_cache_hits = 0
+        self.url_cache_misses = 0
+
+    def url(self, name, parameters=None, expire=None, http_method=None):
+        """
+        Memoizes signed urls per name and expiry, computing the signature on
+        every call is the costly part of rendering lists of files.
+        """
+        signed = self.querystring_auth and (
+            not self.custom_domain or self.cloudfront_signer
+        )
+        if not signed or parameters or http_method:
+            return super().url(name, parameters, expire, http_method)
+
+        if expire is None:
+            expire = self.querystring_expire
+        key = (name, expire)
+        now = time.monotonic()
+        with self._url_cache_lock:
+            cached = self._url_cache.get(key)
+            if cached is not None and cached[1] > now:
+                self._url_cache.move_to_end(key)
+                self.url_cache_hits += 1
+                return cached[0]
+            self.url_cache_misses += 1
+
+        url = super().url(name, expire=expire)
+        valid_until = now + max(expire - self.url_cache_margin, 0)
+        with self._url_cache_lock:
+            self._url_cache[key] = (url, valid_until)
+            self._url_cache.move_to_end(key)
+            if len(self._url_cache) > self.url_cache_size:
+                self._url_cache.popitem(last=False)
+        return url
+
+    def url_cache_info(self) -> dict:
+        lookups = self.url_cache_hits + self.url_cache_misses
+        return {
+            "hits": self.url_cache_hits,
+            "misses": self.url_cache_misses,
+            "hit_rate": self.url_cache_hits / lookups if lookups else 0.0,
+            "size": len(self._url_cache),
+        }
+
+    def delete(self, name):
+        super().delete(name)
+        with self._url_cache_lock:
+            for key in [key for key in self._url_cache if key[0] == name]:
+                del self._url_cache[key]
+
+    def presigned_upload(self, name: str, content_type: str):
+        """
+        Issue a presigned POST the client uses to upload `name` straight to
+        the bucket. Only a form upload can limit the size, so no presigned
+        PUT is offered.
+
+        Parameters:
+            name (str): The path of the file within `location`.
+            content_type (str): The content type the upload must be sent with.
+
+        Returns:
+            dict: The "method", "url" and form "fields" of the upload request,
+            limited to `presigned_upload_max_size` bytes.
+        """
+        key = self._normalize_name(clean_name(name))
+        client = self.connection.meta.client
+        presigned_post = client.generate_presigned_post(
+            Bucket=self.bucket_name,
+            Key=key,
+            Fields={"Content-Type": content_type},
+            Conditions=[
+                {"Content-Type": content_type},
+                ["content-length-range", 1, self.presigned_upload_max_size],
+            ],
+            ExpiresIn=self.presigned_upload_expire,
+        )
+        return {
+            "method": "POST",
+            "url": presigned_post["url"],
+            "fields": presigned_post["fields"],
+        }
+
+
+# boto3 sessions and clients are created per thread by S3Boto3Storage, one
+# instance is shared so their connections are reused between uploads
+media_storage = MediaStorage()
 
 
 class FileAppServices(BaseAppServiceWithAttributeLogger):
@@ -56,6 +179,8 @@ class FileAppServices(BaseAppServiceWithAttributeLogger):
     Methods:
         file_upload_s3(file_obj, file_path_within_bucket): Uploads a file to Amazon S3 storage and returns the file URL.
         create_or_update_file_from_file_obj(file_obj, user, file_instance): Creates or updates a file object based on the provided file object, user, and optional file instance.
+        get_presigned_upload(user, file_name, content_type): Issues a presigned POST request to upload a file directly to S3.
+        complete_presigned_upload(user, file_path_within_bucket, file_instance): Creates or updates the file object of a finished presigned upload.
 
     Example:
         # Create an instance of the FileAppServices class
@@ -90,12 +215,105 @@ class FileAppServices(BaseAppServiceWithAttributeLogger):
             # Upload a file to Amazon S3 storage and get the file URL
             file_url = file_app_service.file_upload_s3(file_obj, file_path_within_bucket)
         """
-        file_obj_copy = file_obj
-        media_storage = MediaStorage()
-        media_storage.save(file_path_within_bucket, file_obj_copy)
-        file_url = media_storage.url(file_path_within_bucket)
+        file_obj.seek(0)
+        name = media_storage.save(file_path_within_bucket, file_obj)
+        file_url = media_storage.url(name)
         return file_url
 
+    def get_file_path_within_bucket(self, user: User, file_name: str) -> str:
+        # client file names must not climb out of the user's prefix
+        try:
+            file_name = get_valid_filename(os.path.basename(file_name))
+        except SuspiciousFileOperation:
+            file_name = "file"
+        return os.path.join(user.username, f"{get_random_string(15)}_{file_name}")
+
+    def get_user_file_path(self, user: User, file_path_within_bucket: str):
+        """
+        Returns the normalized path if it lies within the user's prefix,
+        `None` otherwise.
+        """
+        # normpath again, clean_name converts backslashes after normalizing
+        file_path = posixpath.normpath(clean_name(file_path_within_bucket))
+        if not file_path.startswith(f"{user.username}/"):
+            return None
+        return file_path
+
+    def get_presigned_upload(
+        self, user: User, file_name: str, content_type: str
+    ) -> dict:
+        """
+        Issues a presigned request to upload a file directly to S3, the file
+        bytes never pass through the app servers.
+
+        Parameters:
+            user (User): The user uploading the file.
+            file_name (str): The name of the file on the client.
+            content_type (str): The content type of the file.
+
+        Returns:
+            dict: The upload request and the "file_path" to pass to
+            `complete_presigned_upload` once the upload is done.
+
+        Example:
+            upload = file_app_service.get_presigned_upload(user, "cv.pdf", "application/pdf")
+            # the client uploads to upload["url"] with upload["fields"]
+            file_obj = file_app_service.complete_presigned_upload(user, upload["file_path"])
+        """
+        file_path_within_bucket = self.get_file_path_within_bucket(user, file_name)
+        upload = media_storage.presigned_upload(file_path_within_bucket, content_type)
+        upload["file_path"] = file_path_within_bucket
+        return upload
+
+    def complete_presigned_upload(
+        self, user: User, file_path_within_bucket: str, file_instance: File = None
+    ) -> File:
+        """
+        Creates or updates the File of a presigned upload once the client has
+        uploaded it. Completing the same upload again returns its File.
+
+        Parameters:
+            user (User): The user who requested the upload.
+            file_path_within_bucket (str): The "file_path" of the presigned upload.
+            file_instance (File, optional): An existing file instance to point to the upload.
+
+        Returns:
+            File: The created or updated file object.
+
+        Raises:
+            FileObjectCreateException: If the path does not belong to the user or
+            nothing was uploaded to it.
+        """
+        # users can only complete uploads issued for their own prefix
+        file_path_within_bucket = self.get_user_file_path(user, file_path_within_bucket)
+        if file_path_within_bucket is None or not media_storage.exists(
+            file_path_within_bucket
+        ):
+            raise FileObjectCreateException(
+                "file-object-exception", "Uploaded file not found.", self.log
+            )
+
+        file_url = media_storage.url(file_path_within_bucket)
+        # signed urls differ per call, the part before the query is the object
+        object_url = file_url.split("?", 1)[0]
+        with transaction.atomic():
+            if file_instance:
+                file_instance.url = file_url
+                file_instance.save()
+                return file_instance
+            existing_file = File.objects.filter(
+                Q(url=object_url) | Q(url__startswith=f"{object_url}?"),
+                uploader=str(user.id),
+            ).first()
+            if existing_file is not None:
+                return existing_file
+            file_factory = self.file_services.get_file_factory()
+            file_obj = file_factory.build_entity_with_id(
+                uploader=str(user.id), url=file_url
+            )
+            file_obj.save()
+            return file_obj
+
     def create_or_update_file_from_file_obj(
         self, file_obj, user: User, file_instance: File = None
     ) -> File:
@@ -123,14 +341,22 @@ class FileAppServices(BaseAppServiceWithAttributeLogger):
             # Create or update a file object based on the provided file object and user
             file_obj = file_app_service.create_or_update_file_from_file_obj(file_obj, user, file_instance)
         """
+        file_path_within_bucket = self.get_file_path_within_bucket(
+            user, file_obj.name
+        )
+        # the upload can take long, it must not hold a DB transaction open
+        try:
+            file_url = self.file_upload_s3(
+                file_obj=file_obj, file_path_within_bucket=file_path_within_bucket
+            )
+        except Exception as e:
+            self.log.error(f"file upload failed {file_path_within_bucket}: {e}")
+            raise FileObjectCreateException(
+                "file-object-exception", "File is not saved try again.", self.log
+            )
+
         try:
             with transaction.atomic():
-                file_path_within_bucket = os.path.join(
-                    user.username, f"{get_random_string(15)}_{file_obj.name}"
-                )
-                file_url = self.file_upload_s3(
-                    file_obj=file_obj, file_path_within_bucket=file_path_within_bucket
-                )
                 if file_instance:
                     file_instance.url = file_url
                     file_instance.save()
@@ -143,6 +369,8 @@ class FileAppServices(BaseAppServiceWithAttributeLogger):
 
                 return file_obj
         except Exception as e:
+            # do not leave an object behind that no File row points to
+            media_storage.delete(file_path_within_bucket)
             raise FileObjectCreateException(
                 "file-object-exception", "File is not saved try again.", self.log
             )
@@ -0,0 +1,15 @@
+from rest_framework import serializers
+
+
+class PresignedUploadSerializer(serializers.Serializer):
+    file_name = serializers.CharField(max_length=200)
+    content_type = serializers.CharField(max_length=100)
+
+
+class PresignedUploadCompleteSerializer(serializers.Serializer):
+    file_path = serializers.CharField(max_length=500)
+
+
+class FileSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    url = serializers.CharField()
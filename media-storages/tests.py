@@ -0,0 +1,58 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+from storages.utils import clean_name
+
+from . import custom_storage
+from .custom_storage import FileAppServices, FileObjectCreateException
+
+
+class FileAppServicesTestCase(SimpleTestCase):
+    def setUp(self):
+        self.file_app_services = FileAppServices(mock.Mock())
+        self.alice = mock.Mock(username="alice", id=1)
+
+    def test_file_name_cannot_leave_user_prefix(self):
+        for file_name in ["../../../bob/x", "..\\..\\bob\\x", "/bob/x", ".."]:
+            file_path = self.file_app_services.get_file_path_within_bucket(
+                self.alice, file_name
+            )
+            self.assertTrue(clean_name(file_path).startswith("alice/"), file_path)
+            self.assertNotIn("/", file_path[len("alice/") :])
+
+    @mock.patch.object(custom_storage, "media_storage")
+    def test_complete_rejects_traversal(self, media_storage):
+        media_storage.exists.return_value = True
+        for file_path in ["alice/../bob/f", "alice\\..\\bob\\f", "bob/f"]:
+            with self.assertRaises(FileObjectCreateException):
+                self.file_app_services.complete_presigned_upload(
+                    self.alice, file_path
+                )
+        media_storage.exists.assert_not_called()
+
+    @mock.patch.object(custom_storage, "transaction", create=True)
+    @mock.patch.object(custom_storage, "File", create=True)
+    @mock.patch.object(custom_storage, "media_storage")
+    def test_repeated_complete_returns_existing_file(
+        self, media_storage, file_model, transaction
+    ):
+        media_storage.exists.return_value = True
+        media_storage.url.return_value = "https://cdn/media/alice/f?signature=1"
+        file_services = self.file_app_services.file_services = mock.Mock()
+        existing_files = file_model.objects.filter.return_value
+        existing_files.first.return_value = None
+
+        file_obj = self.file_app_services.complete_presigned_upload(
+            self.alice, "alice/f"
+        )
+        existing_files.first.return_value = file_obj
+        media_storage.url.return_value = "https://cdn/media/alice/f?signature=2"
+        self.assertIs(
+            self.file_app_services.complete_presigned_upload(self.alice, "alice/f"),
+            file_obj,
+        )
+
+        file_factory = file_services.get_file_factory.return_value
+        file_factory.build_entity_with_id.assert_called_once()
+        lookup_q = file_model.objects.filter.call_args.args[0]
+        self.assertIn(("url", "https://cdn/media/alice/f"), lookup_q.children)
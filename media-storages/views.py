@@ -0,0 +1,86 @@
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+from focus_power.application.user.services import UserAppServices
+from focus_power.infrastructure.custom_response.response_and_error import APIResponse
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .custom_storage import FileAppServices
+from .serializers import (
+    FileSerializer,
+    PresignedUploadCompleteSerializer,
+    PresignedUploadSerializer,
+)
+
+
+class PresignedUploadViewSet(viewsets.ViewSet):
+    """
+    API endpoints to upload files directly to S3
+
+    - create: issues the presigned POST request for the upload.
+    - complete: called once the upload finished, creates the File.
+    """
+
+    authentication_classes = (JWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+
+    def get_serializer_class(self):
+        if self.action == "complete":
+            return PresignedUploadCompleteSerializer
+        return PresignedUploadSerializer
+
+    def create(self, request):
+        serializer = self.get_serializer_class()(data=request.data)
+        if not serializer.is_valid():
+            return APIResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                errors=serializer.errors,
+                message="Invalid data",
+                for_error=True,
+            )
+        file_app_services = FileAppServices(UserAppServices())
+        try:
+            upload = file_app_services.get_presigned_upload(
+                user=request.user,
+                file_name=serializer.validated_data["file_name"],
+                content_type=serializer.validated_data["content_type"],
+            )
+        except (BotoCoreError, ClientError) as e:
+            file_app_services.log.error(f"presigned upload not issued: {e}")
+            return APIResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                errors={"storage": ["Upload could not be issued, try again."]},
+                message="Storage unavailable",
+                for_error=True,
+            )
+        return APIResponse(data=upload, message="Successfully issued upload")
+
+    @action(detail=False, methods=["post"], name="complete")
+    def complete(self, request):
+        serializer = self.get_serializer_class()(data=request.data)
+        if not serializer.is_valid():
+            return APIResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                errors=serializer.errors,
+                message="Invalid data",
+                for_error=True,
+            )
+        try:
+            file_app_services = FileAppServices(UserAppServices())
+            file_obj = file_app_services.complete_presigned_upload(
+                user=request.user,
+                file_path_within_bucket=serializer.validated_data["file_path"],
+            )
+            return APIResponse(
+                data=FileSerializer(file_obj).data,
+                message="Successfully uploaded file",
+            )
+        except settings.LAZY_EXCEPTIONS as e:
+            return APIResponse(
+                status_code=e.status_code,
+                errors=e.error_data(),
+                message=e.message,
+                for_error=True,
+            )
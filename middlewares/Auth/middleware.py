@@ -30,9 +30,10 @@ class UacMiddleware:
 
 
 class MiddlewareWithLogger(UacMiddleware):
+    log = AttributeLogger(logging.getLogger(__name__))
+
     def process_view(self, viewset, view_func, view_args, view_kwargs):
-        log = AttributeLogger(logging.getLogger(__name__))
-        viewset.log: AttributeLogger = log.with_attributes(
+        viewset.log: AttributeLogger = self.log.with_attributes(
             user_id=viewset.request.user.id
         )
 
@@ -78,9 +79,25 @@ class MiddlewareWithLogger(UacMiddleware):
                         message="Direct report does not found.",
                         for_error=True,
                     )
+        # app services log through the global logger, they pick the user up
+        # from the context until the view returns
+        viewset.log_context_token = AttributeLogger.bind(
+            user_id=viewset.request.user.id
+        )
         return super().process_view(viewset, view_func, view_args, view_kwargs)
 
+    def process_response(self, viewset, response):
+        self.unbind_log_context(viewset)
+        return response
+
+    def unbind_log_context(self, viewset):
+        token = getattr(viewset, "log_context_token", None)
+        if token is not None:
+            AttributeLogger.unbind(token)
+            viewset.log_context_token = None
+
     def process_exception(self, viewset, exception):
+        self.unbind_log_context(viewset)
         viewset.log.debug(
             "Middleware has caught an exception. exception={}".format(str(exception))
         )